@@ -0,0 +1 @@
+"""Benchmarks for the week apps. Run from the repo root, e.g. ``python -m benchmarks.bench_canonical_names``."""
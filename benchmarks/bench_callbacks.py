@@ -0,0 +1,292 @@
+"""Time the week 29 and 30 callbacks against synthetic data of growing size.
+
+    python -m benchmarks.bench_callbacks [--scales 1 10 100 1000] [--output callbacks.json] [--baseline old.json]
+
+For each scale the synthetic ``ewf_*.csv`` and ``rural-investments.csv`` are
+written to a scratch directory, and each week app is loaded from them
+(``FF_DATA_SOURCE``) in a fresh process whose callbacks are then called as
+plain functions: no server, no browser, no network. Every case runs
+``--repeat`` times for its timing, then once more under ``tracemalloc`` for
+its peak memory.
+
+Results are written in the format of ``figure_friday.startup`` reports, one
+phase per ``case@scale``, so a later run is compared against a saved one with
+``--baseline`` (or ``python -m figure_friday.startup new.json old.json``),
+which exits non-zero when a case got slower or hungrier than allowed.
+
+Writing the 1000x data takes a while and needs a few GB of disk; pass
+smaller ``--scales`` for a quick run.
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks import synthetic
+from figure_friday.startup import _max_rss, regressions
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+YEAR = "2024"
+SESSION = "benchmark"
+
+## chart specs as DashChartEditor saves them: column references, no data
+CHARTS = [
+    {
+        "data": [
+            {
+                "type": "scatter",
+                "mode": "markers",
+                "xsrc": "Number of Investments",
+                "ysrc": "Investment Dollars",
+            }
+        ],
+        "layout": {},
+    },
+    {"data": [{"type": "bar", "xsrc": "State Name", "ysrc": "Investment Dollars"}], "layout": {}},
+    {"data": [{"type": "histogram", "xsrc": "Fiscal Year"}], "layout": {}},
+    {"data": [{"type": "box", "xsrc": "Program Area", "ysrc": "Investment Dollars"}], "layout": {}},
+]
+
+
+def write_data(root, scale, weeks):
+    if "29" in weeks:
+        matches = synthetic.EWF_MATCHES * scale
+        synthetic.write_week(
+            root,
+            YEAR,
+            "29",
+            {
+                "ewf_appearances.csv": synthetic.ewf_appearances(matches),
+                "ewf_matches.csv": synthetic.ewf_matches(matches),
+                "ewf_standings.csv": synthetic.ewf_standings(),
+            },
+        )
+    if "30" in weeks:
+        synthetic.write_week(
+            root,
+            YEAR,
+            "30",
+            {
+                "rural-investments.csv": synthetic.rural_investments(
+                    synthetic.RURAL_INVESTMENTS * scale
+                )
+            },
+        )
+
+
+def load_week(week):
+    name = f"week_{YEAR}_{week}"
+    spec = importlib.util.spec_from_file_location(
+        name, os.path.join(ROOT, f"week-{YEAR}-{week}", "app.py")
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _no_progress(*_):
+    pass
+
+
+def week_29_cases(app):
+    """``(name, setup, run)`` for week 29; ``setup()`` returns ``run``'s arguments."""
+    from figure_friday.cleaning import canonical_names
+
+    home = app.home_team
+    full = [
+        [float(home["attendance"].min()), float(home["attendance"].max())],
+        [str(home["date"].min()), str(home["date"].max())],
+        "All",
+        [],
+        [],
+    ]
+    teams = sorted(home["team_name"].unique())[:3]
+    filtered = full[:3] + [teams, []]
+
+    def cold(values):
+        def setup():
+            app.filter_cache.clear()
+            app.figure_cache.clear()
+            return values, False, None
+
+        return setup
+
+    def treemap(values, dark, previous):
+        app.updateTreemap(_no_progress, values, dark, previous, SESSION)
+
+    def warm():
+        ## same filters, other theme: served from cache as a patch
+        state = app.updateTreemap(_no_progress, full, False, None, SESSION)[-1]
+        return full, True, state
+
+    appearances = app.data["ewf_appearances.csv"]
+
+    def names(frame):
+        canonical_names(frame, "team_id", "team_name")
+        canonical_names(frame, "opponent_id", "opponent_name")
+
+    return [
+        ("updateTreemap cold", cold(full), treemap),
+        ("updateTreemap filtered", cold(filtered), treemap),
+        ("updateTreemap warm", warm, treemap),
+        ("canonical_names", lambda: (appearances[appearances["home_team"] == 1].copy(),), names),
+    ]
+
+
+def week_30_cases(app):
+    from figure_friday import charts
+
+    registry = {str(i): i - 1 for i in range(1, len(CHARTS) + 1)}
+
+    def stored():
+        for i, chart in enumerate(CHARTS, 1):
+            app.chart_store.put(SESSION, str(i), chart)
+        return 1, registry, SESSION
+
+    saved = charts.compact_layout(CHARTS)
+
+    def cold():
+        charts._figures.clear()
+        return _no_progress, 1, saved, SESSION
+
+    return [
+        ("saveCharts", stored, app.saveCharts),
+        ("loadCharts cold", cold, app.loadCharts),
+        ("loadCharts warm", lambda: (_no_progress, 1, saved, SESSION), app.loadCharts),
+    ]
+
+
+CASES = {"29": week_29_cases, "30": week_30_cases}
+
+
+def measure(setup, run, repeat):
+    times = []
+    for _ in range(repeat):
+        args = setup()
+        start = time.perf_counter()
+        run(*args)
+        times.append(time.perf_counter() - start)
+    ## memory on a separate run, since tracing slows everything down
+    args = setup()
+    tracemalloc.start()
+    run(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "seconds": statistics.median(times),
+        "min_seconds": min(times),
+        "max_seconds": max(times),
+        "peak_bytes": peak,
+        "count": repeat,
+    }
+
+
+def worker(week, scale, repeat, output):
+    app = load_week(week)
+    results = {}
+    for name, setup, run in CASES[week](app):
+        results[f"{name}@{scale}x"] = measure(setup, run, repeat)
+    results = {"phases": results, "max_rss_bytes": _max_rss()}
+    with open(output, "w") as fh:
+        json.dump(results, fh)
+
+
+def run_scale(scale, weeks, repeat, keep):
+    with tempfile.TemporaryDirectory(prefix=f"ff-bench-{scale}x-") as tmp:
+        root = tempfile.mkdtemp(prefix=f"ff-bench-{scale}x-") if keep else tmp
+        write_data(os.path.join(root, "source"), scale, weeks)
+        env = {
+            **os.environ,
+            "FF_DATA_SOURCE": os.path.join(root, "source"),
+            "FF_CACHE_DIR": os.path.join(root, "cache"),
+            "FF_OFFLINE": "1",
+            "FF_COALESCE_SECONDS": "0",
+        }
+        for name in ("FF_BACKGROUND", "FF_PROFILE_STARTUP", "FF_FIGURE_STORE_DIR"):
+            env.pop(name, None)
+        phases, rss = {}, []
+        for week in weeks:
+            output = os.path.join(tmp, f"week-{week}.json")
+            done = subprocess.run(
+                [
+                    sys.executable, "-m", "benchmarks.bench_callbacks",
+                    "--worker", week, "--scales", str(scale),
+                    "--repeat", str(repeat), "--output", output,
+                ],
+                cwd=ROOT,
+                env=env,
+                capture_output=True,
+                text=True,
+            )
+            if done.returncode:
+                sys.stderr.write(done.stderr)
+                raise RuntimeError(f"week {week} at {scale}x failed")
+            with open(output) as fh:
+                result = json.load(fh)
+            phases.update(result["phases"])
+            rss.append(result["max_rss_bytes"] or 0)
+            for name, p in result["phases"].items():
+                print(
+                    f"{name:<32}{p['seconds']:>10.4f}{p['min_seconds']:>10.4f}"
+                    f"{p['max_seconds']:>10.4f}{p['peak_bytes'] / (1 << 20):>10.1f}",
+                    flush=True,
+                )
+        if keep:
+            print(f"kept the {scale}x data in {root}")
+    return phases, max(rss, default=0)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--weeks", nargs="+", choices=sorted(CASES), default=sorted(CASES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default="callbacks.json")
+    parser.add_argument("--baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--slack", type=float, default=0.05, help="seconds")
+    parser.add_argument("--keep-data", action="store_true", help="keep the generated files")
+    parser.add_argument("--worker", choices=sorted(CASES), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        worker(args.worker, args.scales[0], args.repeat, args.output)
+        return 0
+
+    print(f"{'case':<32}{'median s':>10}{'min s':>10}{'max s':>10}{'peak MB':>10}")
+    phases, rss = {}, []
+    for scale in args.scales:
+        scale_phases, scale_rss = run_scale(scale, args.weeks, args.repeat, args.keep_data)
+        phases.update(scale_phases)
+        rss.append(scale_rss)
+    report = {
+        "name": "callbacks",
+        "seconds": sum(p["seconds"] for p in phases.values()),
+        "peak_bytes": max((p["peak_bytes"] for p in phases.values()), default=0),
+        "max_rss_bytes": max(rss, default=0),
+        "phases": phases,
+    }
+    with open(args.output, "w") as fh:
+        json.dump(report, fh, indent=2)
+    print(f"wrote {args.output}")
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline) as fh:
+        baseline = json.load(fh)
+    found = regressions(report, baseline, args.tolerance, args.slack)
+    for line in found:
+        print(line)
+    return 1 if found else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""Compare the old ``iterrows`` name fix with ``canonical_names``.
+
+    python -m benchmarks.bench_canonical_names [--base-matches 3300] [--loop-max-rows 4000]
+
+Sizes are multiples of the EWF dataset. The old loop is quadratic, so past
+``--loop-max-rows`` its time is extrapolated from the largest measured size.
+"""
+
+import argparse
+import time
+
+from benchmarks.synthetic import ewf_appearances
+from figure_friday.cleaning import canonical_names
+
+
+def iterrows_names(home_team):
+    for i, row in home_team.iterrows():
+        home_team.loc[i, "team_name"] = home_team[
+            home_team["team_id"] == row["team_id"]
+        ].iloc[-1]["team_name"]
+        home_team.loc[i, "opponent_name"] = home_team[
+            home_team["opponent_id"] == row["opponent_id"]
+        ].iloc[-1]["opponent_name"]
+
+
+def grouped_names(home_team):
+    canonical_names(home_team, "team_id", "team_name")
+    canonical_names(home_team, "opponent_id", "opponent_name")
+
+
+def timed(func, df):
+    start = time.perf_counter()
+    func(df)
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-matches", type=int, default=3300)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--loop-max-rows", type=int, default=4000)
+    args = parser.parse_args(argv)
+
+    print(f"{'scale':>6} {'rows':>10} {'iterrows (s)':>14} {'grouped (s)':>12} {'speedup':>9}")
+    measured = None
+    for scale in args.scales:
+        df = ewf_appearances(args.base_matches * scale)
+        home_team = df[df["home_team"] == 1].reset_index(drop=True)
+        rows = len(home_team)
+
+        grouped_copy = home_team.copy()
+        grouped = timed(grouped_names, grouped_copy)
+        if rows <= args.loop_max_rows:
+            loop_copy = home_team.copy()
+            loop = timed(iterrows_names, loop_copy)
+            assert loop_copy.equals(grouped_copy), "results differ"
+            measured = (rows, loop)
+            loop_text = f"{loop:.3f}"
+        elif measured:
+            loop = measured[1] * (rows / measured[0]) ** 2
+            loop_text = f"~{loop:.0f} est."
+        else:
+            loop = None
+            loop_text = "skipped"
+        speedup = f"{loop / grouped:,.0f}x" if loop else "-"
+        print(f"{scale:>6} {rows:>10,} {loop_text:>14} {grouped:>12.4f} {speedup:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""Synthetic datasets shaped like the Figure Friday source files.
+
+Sizes are given in rows of the real files; ``EWF_MATCHES`` and
+``RURAL_INVESTMENTS`` are roughly the published sizes, so multiplying them
+gives the 1x, 10x, ... scales used by the benchmarks.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+EWF_MATCHES = 3300
+RURAL_INVESTMENTS = 20000
+
+
+def _fixtures(rng, n_matches, n_teams):
+    home = rng.integers(0, n_teams, n_matches)
+    away = (home + rng.integers(1, n_teams, n_matches)) % n_teams
+    dates = pd.Timestamp("2011-04-01") + pd.to_timedelta(
+        np.sort(rng.integers(0, 4700, n_matches)), unit="D"
+    )
+    attendance = rng.integers(50, 60000, n_matches).astype(object)
+    attendance[rng.random(n_matches) < 0.1] = None
+    attendance = [f"{a:,}" if a is not None else None for a in attendance]
+    tier = rng.integers(1, 3, n_matches)
+    names = np.array([f"Team {i}" for i in range(n_teams)], dtype=object)
+    return {
+        "home": home,
+        "away": away,
+        "names": names,
+        "columns": {
+            "season_id": "S" + pd.Series(dates.year).astype(str),
+            "season": pd.Series(dates.year).astype(str),
+            "tier": tier,
+            "division": np.where(tier == 1, "Super League", "Championship"),
+            "match_id": [f"M-{i}" for i in range(n_matches)],
+            "match_name": names[home] + " vs " + names[away],
+            "date": dates.strftime("%Y-%m-%d"),
+            "attendance": attendance,
+        },
+    }
+
+
+def ewf_matches(n_matches, n_teams=40, seed=0):
+    """One row per match, matching ``ewf_matches.csv``."""
+    rng = np.random.default_rng(seed)
+    fixtures = _fixtures(rng, n_matches, n_teams)
+    home, away, names = fixtures["home"], fixtures["away"], fixtures["names"]
+    home_score = rng.poisson(1.5, n_matches)
+    away_score = rng.poisson(1.2, n_matches)
+    return pd.DataFrame(
+        {
+            **fixtures["columns"],
+            "home_team_id": [f"T-{t:03d}" for t in home],
+            "home_team_name": names[home],
+            "away_team_id": [f"T-{t:03d}" for t in away],
+            "away_team_name": names[away],
+            "score": [f"{h}-{a}" for h, a in zip(home_score, away_score)],
+            "home_team_score": home_score,
+            "away_team_score": away_score,
+            "result": np.select(
+                [home_score > away_score, home_score < away_score],
+                ["Home team win", "Away team win"],
+                "Draw",
+            ),
+        }
+    )
+
+
+def ewf_appearances(n_matches, n_teams=40, seed=0):
+    """Two rows per match (home and away), matching ``ewf_appearances.csv``.
+
+    About one in ten rows carries an older team name so name canonicalization
+    has something to do.
+    """
+    rng = np.random.default_rng(seed)
+    fixtures = _fixtures(rng, n_matches, n_teams)
+    home, away, names = fixtures["home"], fixtures["away"], fixtures["names"]
+    old_names = np.array([f"Team {i} Ladies" for i in range(n_teams)], dtype=object)
+
+    def side(team, opponent, is_home):
+        renamed = rng.random(n_matches) < 0.1
+        return pd.DataFrame(
+            {
+                **fixtures["columns"],
+                "team_id": [f"T-{t:03d}" for t in team],
+                "team_name": np.where(renamed, old_names[team], names[team]),
+                "opponent_id": [f"T-{t:03d}" for t in opponent],
+                "opponent_name": names[opponent],
+                "home_team": int(is_home),
+                "away_team": int(not is_home),
+            }
+        )
+
+    return pd.concat([side(home, away, True), side(away, home, False)]).sort_values(
+        ["date", "match_id"], kind="stable", ignore_index=True
+    )
+
+
+def ewf_standings(n_seasons=13, n_teams=40, seed=0):
+    """Final positions per season and tier, matching ``ewf_standings.csv``."""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for season in range(2011, 2011 + n_seasons):
+        for tier, teams in enumerate(np.array_split(rng.permutation(n_teams), 2), 1):
+            points = np.sort(rng.integers(0, 60, len(teams)))[::-1]
+            for position, (team, p) in enumerate(zip(teams, points), 1):
+                rows.append((f"S{season}", tier, position, f"T-{team:03d}", f"Team {team}", p))
+    return pd.DataFrame(
+        rows, columns=["season_id", "tier", "position", "team_id", "team_name", "points"]
+    )
+
+
+def rural_investments(n_rows, n_counties=3000, seed=0):
+    """USDA rural development investments, matching ``rural-investments.csv``.
+
+    County FIPS codes keep the leading apostrophe and dollar amounts their
+    thousands separators, as in the published file.
+    """
+    rng = np.random.default_rng(seed)
+    states = np.array(
+        ["Alabama", "Iowa", "Kansas", "Maine", "Montana", "Ohio", "Oregon", "Texas"],
+        dtype=object,
+    )
+    areas = {
+        "Housing": ["Single Family Housing Direct", "Single Family Housing Guaranteed"],
+        "Business": ["Business & Industry Loans", "Rural Business Development Grants"],
+        "Utilities": ["Water & Waste Disposal", "Electric Infrastructure"],
+        "Community Facilities": ["Community Facilities Direct"],
+    }
+    programs = np.array([(a, p) for a, ps in areas.items() for p in ps], dtype=object)
+    county = rng.integers(0, n_counties, n_rows)
+    program = rng.integers(0, len(programs), n_rows)
+    dollars = rng.lognormal(12, 1.5, n_rows).astype("int64")
+    return pd.DataFrame(
+        {
+            "Fiscal Year": rng.integers(2019, 2024, n_rows),
+            "State Name": states[county % len(states)],
+            "County": [f"County {c}" for c in county],
+            "County FIPS": [f"'{1001 + 7 * c}" for c in county],
+            "Program Area": programs[program, 0],
+            "Program": programs[program, 1],
+            "Investment Type": rng.choice(["Grants", "Loans", "Loan Guarantees"], n_rows),
+            "Number of Investments": rng.integers(1, 50, n_rows),
+            "Investment Dollars": [f"{d:,}" for d in dollars],
+        }
+    )
+
+
+def write_week(root, year, week, frames):
+    """Write ``{filename: frame}`` as csv under ``root``, laid out like the Figure Friday repo.
+
+    ``root`` can then stand in for it as ``FF_DATA_SOURCE``.
+    """
+    folder = os.path.join(root, year, f"week-{week}")
+    os.makedirs(folder, exist_ok=True)
+    for filename, df in frames.items():
+        df.to_csv(os.path.join(folder, filename), index=False)
+    return root
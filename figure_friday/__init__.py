@@ -0,0 +1 @@
+"""Shared helpers for the Figure Friday week apps."""
@@ -0,0 +1,99 @@
+"""Background execution for expensive callbacks.
+
+Set ``FF_BACKGROUND=1`` to run callbacks declared with
+``background_callback`` as Dash background callbacks: each call runs in its
+own worker process, managed by a ``DiskcacheManager`` under
+``{FF_CACHE_DIR}/background``, so no broker is needed and a slow figure build
+no longer holds a request thread. A newer call of the same callback, or a
+change to one of its ``cancel`` inputs, terminates the running job.
+
+Without ``FF_BACKGROUND`` (or without ``diskcache``/``multiprocess``
+installed) the same callbacks run inline as usual. Either way the decorated
+function receives ``set_progress`` as its first argument; inline it does
+nothing.
+
+Worker processes don't share in-memory state with the server, so anything a
+background callback stores for later requests must live on disk (see
+``shared_dir`` and ``shared_cache``).
+"""
+
+import functools
+import logging
+import os
+
+from dash import callback
+
+from figure_friday.cache import DiskLRUCache, LRUCache
+from figure_friday.data import _flag, cache_dir
+
+logger = logging.getLogger(__name__)
+
+_manager = None
+
+
+def background_enabled():
+    return _flag("FF_BACKGROUND")
+
+
+def shared_dir(name):
+    """A directory under the cache dir for state shared with worker processes."""
+    return os.path.join(cache_dir(), name)
+
+
+def manager():
+    """The shared ``DiskcacheManager``, or ``None`` when running inline."""
+    global _manager
+    if _manager is None and background_enabled():
+        try:
+            import diskcache
+            from dash import DiskcacheManager
+        except ImportError:
+            logger.warning("FF_BACKGROUND needs diskcache and multiprocess; running inline")
+            return None
+        _manager = DiskcacheManager(diskcache.Cache(shared_dir("background")))
+    return _manager
+
+
+def running_in_background():
+    """Whether ``background_callback`` runs callbacks in worker processes."""
+    return manager() is not None
+
+
+def shared_cache(name, maxsize=128):
+    """An ``LRUCache``, or one on disk under ``shared_dir(name)`` in background mode."""
+    if running_in_background():
+        return DiskLRUCache(shared_dir(name))
+    return LRUCache(maxsize=maxsize)
+
+
+def _no_progress(*_):
+    pass
+
+
+def background_callback(*args, progress, cancel=None, **kwargs):
+    """``dash.callback`` that runs in the background when ``FF_BACKGROUND`` is set.
+
+    ``progress`` is required so the function's signature is the same in both
+    modes.
+    """
+
+    def decorator(func):
+        if running_in_background():
+            callback(
+                *args,
+                background=True,
+                manager=manager(),
+                progress=progress,
+                cancel=cancel,
+                **kwargs,
+            )(func)
+        else:
+
+            @functools.wraps(func)
+            def inline(*inputs):
+                return func(_no_progress, *inputs)
+
+            callback(*args, **kwargs)(inline)
+        return func
+
+    return decorator
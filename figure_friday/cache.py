@@ -0,0 +1,159 @@
+"""Caches for callback results: in-process, or on disk shared between processes."""
+
+import threading
+from collections import OrderedDict
+
+_MISSING = object()
+
+_registry = {}
+
+
+def register(name, cache):
+    """List ``cache`` under ``name`` for the cache metrics; returns ``cache``."""
+    _registry[name] = cache
+    return cache
+
+
+def registered():
+    """``{name: cache}`` for every cache passed to ``register``."""
+    return dict(_registry)
+
+
+class LRUCache:
+    """Bounded least-recently-used mapping with hit/miss counters.
+
+    Safe to share between the request threads of one worker.
+    """
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def keys(self):
+        with self._lock:
+            return list(self._data)
+
+    def get_or_set(self, key, factory):
+        """Return the cached value for ``key``, calling ``factory()`` on a miss."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = factory()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+        }
+
+
+class DiskLRUCache:
+    """``LRUCache`` lookalike on a ``diskcache.Cache`` in ``directory``.
+
+    Every process on the machine opening the same directory shares the
+    entries, e.g. the server and its background callback workers. Bounded by
+    ``size_limit`` bytes instead of a number of entries; hit/miss counters are
+    per process.
+    """
+
+    def __init__(self, directory, size_limit=1 << 28):
+        import diskcache
+
+        self.maxsize = size_limit
+        self.hits = 0
+        self.misses = 0
+        self._cache = diskcache.Cache(
+            directory, eviction_policy="least-recently-used", size_limit=size_limit
+        )
+
+    def __len__(self):
+        return len(self._cache)
+
+    def __contains__(self, key):
+        return key in self._cache
+
+    def get(self, key, default=None):
+        value = self._cache.get(key, _MISSING)
+        if value is _MISSING:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self._cache.set(key, value)
+
+    def pop(self, key, default=None):
+        return self._cache.pop(key, default)
+
+    def get_or_set(self, key, factory):
+        """Return the cached value for ``key``, calling ``factory()`` on a miss."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = factory()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        self._cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._cache),
+            "maxsize": self.maxsize,
+        }
+
+
+def selection_key(values, universe=()):
+    """Normalize a multiselect value for use in a cache key.
+
+    Empty selections and selections covering all of ``universe`` both mean
+    "everything" and map to ``None``; anything else becomes a sorted tuple.
+    """
+    selected = set(values or [])
+    if not selected or (universe and selected.issuperset(universe)):
+        return None
+    return tuple(sorted(selected))
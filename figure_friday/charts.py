@@ -0,0 +1,95 @@
+"""Compact saved chart layouts for ``DashChartEditor`` dashboards.
+
+A saved layout only records what the editor needs to rebuild each chart:
+trace specs whose data are column references (``xsrc``, ``ysrc``, ...) and
+the figure layout. Data arrays are dropped, so a layout stays a few KB no
+matter how large the dataset is::
+
+    {"version": 1, "charts": [{"data": [...], "layout": {...}}, ...]}
+
+Plain lists of figures, as written before the format was versioned, are
+still accepted by ``chart_specs``.
+
+Hydrated figures are cached per chart spec, so restoring a layout again only
+builds the charts that changed. Each batch hydrates against one frame holding
+only the columns its charts reference, instead of a full copy of the dataset
+per trace. Cached figures are shared; treat them as read-only. In background
+mode the cache lives on disk (``figure_friday.background.shared_cache``), so
+the worker processes restoring layouts share it too.
+"""
+
+import json
+import threading
+
+import dash_chart_editor as dce
+
+from figure_friday.background import shared_cache
+from figure_friday.cache import register
+
+VERSION = 1
+
+_figures = register("chart-figures", shared_cache("chart-figures", maxsize=256))
+# dce.chartToPython builds traces through a shared mutable default argument,
+# so concurrent calls would leak trace arguments into each other.
+_hydrate_lock = threading.Lock()
+
+
+def _compact_trace(trace):
+    trace = dict(trace)
+    for key in [k for k in trace if k + "src" in trace]:
+        del trace[key]
+    if "transforms" in trace:
+        trace["transforms"] = [_compact_trace(t) for t in trace["transforms"]]
+    return trace
+
+
+def compact_chart(figure):
+    """Strip data arrays from ``figure``, keeping trace specs and column references."""
+    figure = figure or {}
+    data = [_compact_trace(trace) for trace in figure.get("data") or []]
+    return dce.cleanDataFromFigure({"data": data, "layout": figure.get("layout") or {}})
+
+
+def compact_layout(figures):
+    return {"version": VERSION, "charts": [compact_chart(f) for f in figures]}
+
+
+def _columns(value, df):
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key.endswith("src") and isinstance(item, str) and item in df.columns:
+                yield item
+            else:
+                yield from _columns(item, df)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _columns(item, df)
+
+
+def chart_specs(saved):
+    """Compact chart specs from a saved layout, in either format."""
+    if isinstance(saved, dict):
+        if saved.get("version") != VERSION:
+            raise ValueError(f"unsupported chart layout version {saved.get('version')!r}")
+        saved = saved.get("charts")
+    return [compact_chart(chart) for chart in saved or []]
+
+
+def hydrate(charts, df, name=""):
+    """Figures for compact chart specs, rebuilt from ``df`` in one batch.
+
+    ``name`` identifies the frame in the hydration cache; use a different
+    name whenever the data behind it changes, since in background mode the
+    cache outlives the process.
+    """
+    keys = [(name, json.dumps(chart, sort_keys=True)) for chart in charts]
+    figures = {key: _figures.get(key) for key in keys}
+    missing = [key for key, figure in figures.items() if figure is None]
+    if missing:
+        specs = [json.loads(spec) for _, spec in missing]
+        frame = df[list(dict.fromkeys(_columns(specs, df)))]
+        with _hydrate_lock:
+            for key, chart in zip(missing, specs):
+                figures[key] = dce.chartToPython(chart, frame)
+                _figures.put(key, figures[key])
+    return [figures[key] for key in keys]
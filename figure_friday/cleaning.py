@@ -0,0 +1,52 @@
+"""Column cleaning shared by the week apps."""
+
+import logging
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+_NUMBER = r"[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?"
+
+
+def normalize_numeric(df, columns, dtype="Int64"):
+    """Parse ``columns`` of ``df`` in place into ``dtype``.
+
+    Thousands separators and surrounding whitespace are stripped with Arrow
+    backed string ops and the result is cast without touching Python objects.
+    Empty strings and ``"nan"`` count as missing. Returns
+    ``{column: unparsed count}``.
+    """
+    failed = {}
+    for col in columns:
+        if col not in df.columns:
+            continue
+        values = df[col]
+        if pd.api.types.is_numeric_dtype(values):
+            parsed = values.astype("Float64")
+            bad = pd.Series(False, index=values.index)
+        else:
+            text = values.astype("string[pyarrow]")
+            text = text.str.replace(",", "", regex=False).str.strip()
+            valid = text.str.fullmatch(_NUMBER).fillna(False).astype(bool)
+            parsed = text.where(valid).astype("Float64")
+            bad = ~valid & text.notna() & text.ne("") & text.str.lower().ne("nan")
+        if dtype == "Int64":
+            fractional = parsed.notna() & (parsed % 1 != 0)
+            bad |= fractional
+            parsed = parsed.mask(fractional)
+        df[col] = parsed.astype(dtype)
+        failed[col] = int(bad.sum())
+        if failed[col]:
+            logger.warning("%s: %d values could not be parsed", col, failed[col])
+    return failed
+
+
+def canonical_names(df, id_col, name_col):
+    """Replace ``name_col`` in place with the last name seen for each ``id_col``.
+
+    Teams get renamed over the years; this keeps one label per id so grouping by
+    name doesn't split a club in two. Rows with a missing id keep their name.
+    """
+    last_seen = df.drop_duplicates(id_col, keep="last").set_index(id_col)[name_col]
+    df[name_col] = df[id_col].map(last_seen).where(df[id_col].notna(), df[name_col])
@@ -0,0 +1,87 @@
+"""Coalescing of rapid filter changes.
+
+Two layers keep a burst of filter edits (a slider drag, typing into a
+multiselect) down to one computation per session:
+
+- ``debounced_inputs`` collects the filter values into a ``dcc.Store``
+  client-side and only writes it once the values have been still for
+  ``delay`` ms, so intermediate states never reach the server
+- ``Coalescer`` hands every server request a per-session ticket; a request
+  that a newer one from the same session has superseded stops early and
+  returns ``no_update`` instead of rendering stale results
+
+Tickets are kept in memory, or in a ``diskcache.Cache`` under ``directory``
+when requests are handled by several processes (background callbacks).
+In-memory tickets are per process: under several server workers, requests
+of one session that land on different workers don't supersede each other.
+Requests without a session id (before the session store is filled) are
+never coalesced, since they can't be told apart.
+"""
+
+import threading
+import time
+
+from dash import Input, Output, clientside_callback
+from dash.exceptions import PreventUpdate
+
+from figure_friday.cache import LRUCache
+
+
+class Coalescer:
+    def __init__(self, delay=0.0, maxsize=4096, directory=None):
+        self.delay = delay
+        if directory:
+            import diskcache
+
+            self._tickets = diskcache.Cache(directory, eviction_policy="least-recently-used")
+        else:
+            self._tickets = LRUCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+
+    def ticket(self, session):
+        """Register a new request for ``session`` and return its ticket."""
+        if not session:
+            return None
+        if not isinstance(self._tickets, LRUCache):
+            return self._tickets.incr(session)
+        with self._lock:
+            ticket = self._tickets.get(session, 0) + 1
+            self._tickets.put(session, ticket)
+        return ticket
+
+    def superseded(self, session, ticket):
+        if not session:
+            return False
+        return self._tickets.get(session, 0) != ticket
+
+    def wait(self, session):
+        """Ticket for a new request, after ``delay`` if no newer one arrived.
+
+        Raises ``PreventUpdate`` when a newer request for ``session`` came
+        in while waiting.
+        """
+        ticket = self.ticket(session)
+        if self.delay and session:
+            time.sleep(self.delay)
+            if self.superseded(session, ticket):
+                raise PreventUpdate
+        return ticket
+
+
+def debounced_inputs(store_id, inputs, delay=250):
+    """Write the values of ``inputs`` to ``store_id`` once they settle."""
+    clientside_callback(
+        """async (...values) => {
+            const timers = window.ffDebounce = window.ffDebounce || {}
+            const ticket = (timers["%s"] || 0) + 1
+            timers["%s"] = ticket
+            await new Promise((resolve) => setTimeout(resolve, %d))
+            if (timers["%s"] !== ticket) {
+                return window.dash_clientside.no_update
+            }
+            return values
+        }"""
+        % (store_id, store_id, delay, store_id),
+        Output(store_id, "data"),
+        [Input(id, prop) for id, prop in inputs],
+    )
@@ -0,0 +1,73 @@
+"""The private Dash callback registries the host needs, in one place.
+
+Dash only copies callbacks declared with ``dash.callback`` into an app on its
+first request, and has no public way to add more afterwards. The host mounts
+weeks later than that, so it moves them over itself the way
+``Dash._setup_server`` does. That relies on Dash internals, checked against
+the versions in ``TESTED``: ``check()`` warns on other versions and fails
+when the internals are gone.
+"""
+
+import logging
+
+import dash
+from dash import _callback
+
+logger = logging.getLogger(__name__)
+
+TESTED = ("2.17.",)
+_NEEDED = ("GLOBAL_CALLBACK_MAP", "GLOBAL_CALLBACK_LIST", "context_value")
+
+
+def check():
+    missing = [name for name in _NEEDED if not hasattr(_callback, name)]
+    if missing:
+        raise RuntimeError(
+            f"Dash {dash.__version__} lacks {', '.join(missing)}; "
+            f"the host needs Dash {' or '.join(v + 'x' for v in TESTED)}"
+        )
+    if not dash.__version__.startswith(TESTED):
+        logger.warning(
+            "the host is tested with Dash %s, not %s",
+            " or ".join(v + "x" for v in TESTED),
+            dash.__version__,
+        )
+
+
+def snapshot(app):
+    """The app's callbacks, for ``restore``."""
+    return dict(app.callback_map), len(app._callback_list)
+
+
+def restore(app, state):
+    """Drop every callback registered since ``snapshot``, declared or merged."""
+    callbacks, listed = state
+    _callback.GLOBAL_CALLBACK_MAP.clear()
+    _callback.GLOBAL_CALLBACK_LIST.clear()
+    app.callback_map = callbacks
+    del app._callback_list[listed:]
+
+
+def merge_callbacks(app):
+    """Move callbacks declared since the first request into ``app``.
+
+    Returns ``(cancel input, manager)`` for the background callbacks among
+    them, whose cancel callbacks the caller has to register.
+    """
+    for k in list(_callback.GLOBAL_CALLBACK_MAP):
+        app.callback_map[k] = _callback.GLOBAL_CALLBACK_MAP.pop(k)
+    app._callback_list.extend(_callback.GLOBAL_CALLBACK_LIST)
+    _callback.GLOBAL_CALLBACK_LIST.clear()
+    cancels = []
+    for cb in list(app.callback_map.values()):
+        long = cb.get("long")
+        if long and "cancel_inputs" in long:
+            cancels.extend((cancel, long.get("manager")) for cancel in long.pop("cancel_inputs"))
+    return cancels
+
+
+def terminate_jobs(job_ids):
+    """Terminate background jobs from inside a callback."""
+    executor = _callback.context_value.get().background_callback_manager
+    for job_id in job_ids:
+        executor.terminate_job(job_id)
@@ -0,0 +1,204 @@
+"""Dataset loading with a local columnar cache.
+
+Raw files are fetched once from the Figure Friday repo (or a local fixture
+directory laid out the same way), parsed, and stored as uncompressed Arrow
+IPC (Feather) files keyed by year/week/filename plus a hash of the raw bytes.
+Later starts reopen the cached copy memory-mapped without touching the network.
+A cached copy only counts for the source it was read from, and for a local
+source only while the file keeps its size and modification time.
+
+Environment variables:
+
+- ``FF_DATA_SOURCE``: base url or local directory standing in for GitHub
+- ``FF_CACHE_DIR``: where cached files live (default ``~/.cache/figure-friday``)
+- ``FF_OFFLINE``: when truthy, never touch the network
+- ``FF_REFRESH``: when truthy, re-fetch even if a cached copy exists
+"""
+
+import hashlib
+import io
+import json
+import logging
+import os
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from figure_friday import startup
+
+BASE_URL = "https://raw.githubusercontent.com/plotly/Figure-Friday/main"
+
+logger = logging.getLogger(__name__)
+
+
+def _flag(name):
+    return os.environ.get(name, "").lower() in ("1", "true", "yes", "on")
+
+
+def cache_dir():
+    return os.environ.get(
+        "FF_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "figure-friday")
+    )
+
+
+def data_source():
+    return os.environ.get("FF_DATA_SOURCE", BASE_URL)
+
+
+def _is_local(source):
+    return "://" not in source or source.startswith("file://")
+
+
+def _local_path(source, year, week, filename):
+    root = source[len("file://") :] if source.startswith("file://") else source
+    return os.path.join(root, year, f"week-{week}", filename)
+
+
+def _stamp(source, year, week, filename):
+    """Size and mtime of a local source file, ``None`` for remote sources."""
+    if not _is_local(source):
+        return None
+    try:
+        stat = os.stat(_local_path(source, year, week, filename))
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _fetch(source, year, week, filename, offline):
+    if _is_local(source):
+        with open(_local_path(source, year, week, filename), "rb") as fh:
+            return fh.read()
+    if offline:
+        raise FileNotFoundError(
+            f"{year}/week-{week}/{filename} is not cached and offline mode is on"
+        )
+    with urllib.request.urlopen(f"{source}/{year}/week-{week}/{filename}") as resp:
+        return resp.read()
+
+
+def read_raw(raw, filename):
+    if ".csv" in filename.lower():
+        return pd.read_csv(io.BytesIO(raw))
+    return pd.read_excel(io.BytesIO(raw))
+
+
+def _locate(year, week, filename, source, offline=None, refresh=None):
+    """The cached Arrow copy of ``filename`` as ``(path, None)``, else ``(None, raw)``."""
+    offline = _flag("FF_OFFLINE") if offline is None else offline
+    refresh = _flag("FF_REFRESH") if refresh is None else refresh
+
+    folder = os.path.join(cache_dir(), year, f"week-{week}")
+    manifest_path = os.path.join(folder, f"{filename}.json")
+    if not refresh and os.path.exists(manifest_path):
+        with open(manifest_path) as fh:
+            manifest = json.load(fh)
+        cached = os.path.join(folder, manifest["file"])
+        fresh = manifest.get("source") == source and manifest.get("stamp") == _stamp(
+            source, year, week, filename
+        )
+        if fresh and os.path.exists(cached):
+            return cached, None
+    return None, _fetch(source, year, week, filename, offline)
+
+
+def _parse(year, week, filename, located, source):
+    cached, raw = located
+    if cached:
+        return feather.read_table(cached, memory_map=True).to_pandas()
+
+    df = read_raw(raw, filename)
+    digest = hashlib.sha256(raw).hexdigest()
+    stem = os.path.splitext(filename)[0]
+    name = f"{stem}-{digest[:16]}.arrow"
+    folder = os.path.join(cache_dir(), year, f"week-{week}")
+    manifest_path = os.path.join(folder, f"{filename}.json")
+    try:
+        os.makedirs(folder, exist_ok=True)
+        tmp = os.path.join(folder, f".{name}.{os.getpid()}")
+        feather.write_feather(df, tmp, compression="uncompressed")
+        os.replace(tmp, os.path.join(folder, name))
+        with open(f"{manifest_path}.{os.getpid()}", "w") as fh:
+            json.dump(
+                {
+                    "file": name,
+                    "sha256": digest,
+                    "source": source,
+                    "stamp": _stamp(source, year, week, filename),
+                },
+                fh,
+            )
+        os.replace(f"{manifest_path}.{os.getpid()}", manifest_path)
+    except (OSError, pa.ArrowException, ValueError, TypeError):
+        logger.warning("could not cache %s/week-%s/%s", year, week, filename, exc_info=True)
+    return df
+
+
+def load_file(year, week, filename, source=None, offline=None, refresh=None):
+    """Return the parsed ``filename`` for ``year``/``week``, caching it on disk."""
+    source = source or data_source()
+    located = _locate(year, week, filename, source, offline, refresh)
+    return _parse(year, week, filename, located, source)
+
+
+def load_files(year, week, files, max_workers=None, source=None, **kwargs):
+    """Fetch and parse every file in ``files`` in parallel, keyed by filename.
+
+    Each file is parsed as soon as it is fetched, so a slow download doesn't
+    hold up parsing the others. The whole is one ``load`` startup phase; each
+    file's fetch and parse times are recorded on their own.
+    """
+    source = source or data_source()
+
+    def load(filename):
+        start = time.perf_counter()
+        located = _locate(year, week, filename, source, **kwargs)
+        fetched = time.perf_counter()
+        df = _parse(year, week, filename, located, source)
+        return df, fetched - start, time.perf_counter() - fetched
+
+    start = time.perf_counter()
+    startup.mark("load")
+    with ThreadPoolExecutor(max_workers=max_workers or max(len(files), 1)) as pool:
+        loaded = list(pool.map(load, files))
+    for filename, (df, fetching, parsing) in zip(files, loaded):
+        startup.record(f"{year}/week-{week}/{filename}", fetch=fetching, parse=parsing)
+        logger.info(
+            "loaded %s/week-%s/%s: %d rows, fetched in %.3fs, parsed in %.3fs",
+            year,
+            week,
+            filename,
+            len(df),
+            fetching,
+            parsing,
+        )
+    logger.info(
+        "loaded %d files for %s/week-%s in %.3fs",
+        len(files),
+        year,
+        week,
+        time.perf_counter() - start,
+    )
+    return {filename: df for filename, (df, _, _) in zip(files, loaded)}
+
+
+def dataset_version(year, week, files):
+    """A short hash of the raw bytes behind ``files``, from their cache manifests.
+
+    Changes whenever any file is re-fetched with new contents. Files that
+    couldn't be cached contribute only their name.
+    """
+    sha = hashlib.sha256()
+    folder = os.path.join(cache_dir(), year, f"week-{week}")
+    for filename in files:
+        try:
+            with open(os.path.join(folder, f"{filename}.json")) as fh:
+                digest = json.load(fh)["sha256"]
+        except (OSError, ValueError, KeyError):
+            digest = ""
+        sha.update(f"{filename}:{digest}\n".encode())
+    return sha.hexdigest()[:16]
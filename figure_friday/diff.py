@@ -0,0 +1,63 @@
+"""Minimal ``Patch`` updates between two figure specs.
+
+``diff_patch(old, new)`` walks both specs and records only what changed:
+dicts are compared key by key, lists of traces index by index, and any other
+value (including data arrays such as ``x``, ``y`` and ``values``) is replaced
+whole when it differs. Values that are the same object, like a cached
+template, are skipped without comparing their contents.
+"""
+
+import numpy as np
+from dash import Patch, no_update
+
+
+def _equal(old, new):
+    if old is new:
+        return True
+    if isinstance(old, np.ndarray) or isinstance(new, np.ndarray):
+        old, new = np.asarray(old), np.asarray(new)
+        if old.shape != new.shape:
+            return False
+        if old.dtype.kind == "f" and new.dtype.kind == "f":
+            return bool(np.array_equal(old, new, equal_nan=True))
+        try:
+            return bool(np.array_equal(old, new))
+        except TypeError:
+            return False
+    try:
+        return bool(old == new)
+    except (TypeError, ValueError):
+        return False
+
+
+def _diff(old, new, patch):
+    changed = False
+    for key, value in new.items():
+        if key not in old:
+            patch[key] = value
+            changed = True
+        elif isinstance(value, dict) and isinstance(old[key], dict):
+            changed |= _diff(old[key], value, patch[key])
+        elif (
+            isinstance(value, list)
+            and isinstance(old[key], list)
+            and len(value) == len(old[key])
+            and value
+            and all(isinstance(v, dict) for v in value + old[key])
+        ):
+            for i, (before, after) in enumerate(zip(old[key], value)):
+                changed |= _diff(before, after, patch[key][i])
+        elif not _equal(old[key], value):
+            patch[key] = value
+            changed = True
+    for key in old:
+        if key not in new:
+            del patch[key]
+            changed = True
+    return changed
+
+
+def diff_patch(old, new):
+    """A ``Patch`` turning figure ``old`` into ``new``, or ``no_update`` if equal."""
+    patch = Patch()
+    return patch if _diff(old, new, patch) else no_update
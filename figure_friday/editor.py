@@ -0,0 +1,117 @@
+"""Lazily loaded data sources for ``DashChartEditor``.
+
+Embedding ``df.to_dict("list")`` as ``dataSources`` serializes every column
+into the page layout. Instead, frames are registered here and served as
+pre-serialized orjson from a Flask route; the editor fetches them client-side
+the first time its modal opens. Payloads are cached per
+(frame, columns, rows), so every session reuses the same bytes.
+
+``?columns=a,b`` limits the payload to a column subset and ``?rows=n`` sends
+an evenly spaced preview of ``n`` rows. ``FF_EDITOR_PREVIEW_ROWS`` sets the
+default preview size.
+"""
+
+import hashlib
+import os
+
+import flask
+import numpy as np
+import orjson
+import pandas as pd
+from dash import Input, Output, State, clientside_callback, get_app, get_relative_path
+
+from figure_friday.cache import LRUCache, register
+
+ROUTE = "/_ff/data-sources/"
+
+_frames = {}
+_payloads = register("editor-payloads", LRUCache(maxsize=16))
+_routes = set()
+
+
+def _column(values):
+    if pd.api.types.is_datetime64_any_dtype(values):
+        values = values.dt.strftime("%Y-%m-%dT%H:%M:%S")
+    if pd.api.types.is_bool_dtype(values) or not pd.api.types.is_numeric_dtype(values):
+        return values.astype(object).where(values.notna(), None).tolist()
+    if values.isna().any():
+        return values.to_numpy(dtype="float64", na_value=np.nan)
+    return values.to_numpy()
+
+
+def payload(name, columns=None, rows=None):
+    """orjson bytes of ``{column: values}`` for the registered frame ``name``."""
+    key = (name, tuple(columns or ()), rows)
+
+    def build():
+        df = _frames[name]
+        if columns:
+            df = df[[c for c in columns if c in df.columns]]
+        if rows and len(df) > rows:
+            df = df.iloc[np.linspace(0, len(df) - 1, rows).astype(int)]
+        return orjson.dumps(
+            {col: _column(df[col]) for col in df.columns},
+            option=orjson.OPT_SERIALIZE_NUMPY,
+        )
+
+    return _payloads.get_or_set(key, build)
+
+
+def _serve(name):
+    if name not in _frames:
+        flask.abort(404)
+    args = flask.request.args
+    columns = [c for c in args.get("columns", "").split(",") if c] or None
+    rows = args.get("rows", type=int) or None
+    body = payload(name, columns, rows)
+    etag = hashlib.sha1(body).hexdigest()
+    if flask.request.if_none_match.contains(etag):
+        return flask.Response(status=304)
+    response = flask.Response(body, mimetype="application/json")
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = 3600
+    return response
+
+
+def register_route(server):
+    """Add the data source route to ``server``.
+
+    ``data_source_url`` does this on first use; a server that can't take new
+    routes by then (one that already served a request) must call it up front.
+    """
+    if server not in _routes:
+        _routes.add(server)
+        server.add_url_rule(
+            f"{ROUTE}<path:name>", "ff_data_sources", _serve, methods=["GET"]
+        )
+
+
+def data_source_url(name, df, columns=None, rows=None):
+    """Register ``df`` as ``name`` and return the url the editor should fetch."""
+    _frames[name] = df
+    register_route(get_app().server)
+    rows = rows or int(os.environ.get("FF_EDITOR_PREVIEW_ROWS", 0)) or None
+    query = []
+    if columns:
+        query.append("columns=" + ",".join(columns))
+    if rows:
+        query.append(f"rows={rows}")
+    return get_relative_path(ROUTE + name) + ("?" + "&".join(query) if query else "")
+
+
+def lazy_data_sources(editor_id, modal_id, url_store_id):
+    """Fetch ``editor_id``'s ``dataSources`` the first time ``modal_id`` opens."""
+    clientside_callback(
+        """async (opened, sources, url) => {
+            if (!opened || !url || (sources && Object.keys(sources).length)) {
+                return dash_clientside.no_update
+            }
+            const response = await fetch(url)
+            return await response.json()
+        }""",
+        Output(editor_id, "dataSources"),
+        Input(modal_id, "opened"),
+        State(editor_id, "dataSources"),
+        State(url_store_id, "data"),
+    )
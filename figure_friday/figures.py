@@ -0,0 +1,87 @@
+"""Server-side store of the figures shown on dashboard cards.
+
+Cards are keyed by ``(session, card index)``; the session id lives in a
+browser ``dcc.Store`` so callbacks can look figures up without the client
+uploading them. Figures are kept in an in-process ``LRUCache`` by default.
+Set ``FF_FIGURE_STORE_DIR`` (requires ``diskcache``) to keep them on disk
+instead, shared by every worker on the machine; each named store gets its
+own subdirectory. The choice is made on first use, so ``serve`` can still
+set ``FF_FIGURE_STORE_DIR`` when it starts several workers.
+"""
+
+import os
+import threading
+
+from figure_friday.cache import LRUCache
+
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+
+class FigureStore:
+    def __init__(self, name="figures", directory=None, maxsize=1024):
+        self.name = name
+        self._directory = directory
+        self._maxsize = maxsize
+        self._disk = None
+        self._memory = None
+        self._lock = threading.Lock()
+
+    def _open(self):
+        with self._lock:
+            if self._disk is not None or self._memory is not None:
+                return
+            directory = self._directory or os.environ.get("FF_FIGURE_STORE_DIR")
+            if directory:
+                if diskcache is None:
+                    raise ImportError("FF_FIGURE_STORE_DIR requires diskcache")
+                self._disk = diskcache.Cache(
+                    os.path.join(directory, self.name),
+                    eviction_policy="least-recently-used",
+                    tag_index=True,
+                )
+            else:
+                self._memory = LRUCache(maxsize=self._maxsize)
+
+    def get(self, session, index):
+        if not session or index is None:
+            return None
+        self._open()
+        key = (session, int(index))
+        if self._disk is not None:
+            return self._disk.get(key)
+        return self._memory.get(key)
+
+    def put(self, session, index, figure):
+        if not session or index is None:
+            return
+        self._open()
+        key = (session, int(index))
+        if self._disk is not None:
+            self._disk.set(key, figure, tag=session)
+        else:
+            self._memory.put(key, figure)
+
+    def discard(self, session, index):
+        if not session or index is None:
+            return
+        self._open()
+        key = (session, int(index))
+        if self._disk is not None:
+            self._disk.delete(key)
+        else:
+            self._memory.pop(key)
+
+    def clear(self, session):
+        """Drop every figure of ``session``."""
+        if not session:
+            return
+        self._open()
+        if self._disk is not None:
+            self._disk.evict(session)
+        else:
+            for key in self._memory.keys():
+                if key[0] == session:
+                    self._memory.pop(key)
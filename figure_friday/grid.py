@@ -0,0 +1,184 @@
+"""AG Grids backed by the infinite row model.
+
+Instead of embedding ``rowData`` in the layout, ``infinite_grid`` registers the
+frame server-side and the grid asks for blocks of rows as the user scrolls.
+One ``MATCH`` callback per id type answers those requests with the sorted,
+filtered slice, so the page payload doesn't grow with the dataset.
+
+The grid's ``dashGridOptions["quickFilterText"]`` is answered from a
+``SearchIndex`` built when the frame is registered, i.e. at import; patching
+it refreshes the grid's row cache.
+"""
+
+import json
+
+import dash_ag_grid as dag
+import numpy as np
+import pandas as pd
+from dash import MATCH, Input, Output, State, callback, clientside_callback, ctx, no_update
+
+from figure_friday.cache import LRUCache, register
+from figure_friday.search import SearchIndex
+
+BLOCK_SIZE = 100
+
+_frames = {}
+_indexes = {}
+_registered = set()
+_orders = register("grid-orders", LRUCache(maxsize=256))
+
+
+def register_frame(id, df):
+    """Serve ``df`` to the grid with ``id``.
+
+    Call it at import, so every worker can answer the grid's requests
+    whichever one built the layout, and the search index is ready before the
+    first search.
+    """
+    key = (id["type"], id["index"])
+    if _frames.get(key) is not df:
+        _frames[key] = df
+        _indexes[key] = SearchIndex(df)
+    _register(id["type"])
+
+
+def infinite_grid(id, df, **kwargs):
+    """Return an ``AgGrid`` with ``id`` that serves ``df`` block by block."""
+    register_frame(id, df)
+    options = {
+        "cacheBlockSize": BLOCK_SIZE,
+        "maxBlocksInCache": 20,
+        "infiniteInitialRowCount": BLOCK_SIZE,
+        "quickFilterText": "",
+        **kwargs.pop("dashGridOptions", {}),
+    }
+    return dag.AgGrid(
+        id=id,
+        rowModelType="infinite",
+        columnDefs=kwargs.pop("columnDefs", [{"field": x} for x in df.columns]),
+        dashGridOptions=options,
+        **kwargs,
+    )
+
+
+def quick_filter(key, text):
+    """Positions of rows matching every whitespace separated word of ``text``."""
+    return _indexes[key].search(text)
+
+
+_TEXT_FILTERS = {
+    "contains": lambda s, v: s.str.contains(v, case=False, regex=False),
+    "notContains": lambda s, v: ~s.str.contains(v, case=False, regex=False),
+    "equals": lambda s, v: s.str.lower() == v.lower(),
+    "notEqual": lambda s, v: s.str.lower() != v.lower(),
+    "startsWith": lambda s, v: s.str.lower().str.startswith(v.lower()),
+    "endsWith": lambda s, v: s.str.lower().str.endswith(v.lower()),
+}
+
+_COMPARE_FILTERS = {
+    "equals": lambda s, a, b: s == a,
+    "notEqual": lambda s, a, b: s != a,
+    "lessThan": lambda s, a, b: s < a,
+    "lessThanOrEqual": lambda s, a, b: s <= a,
+    "greaterThan": lambda s, a, b: s > a,
+    "greaterThanOrEqual": lambda s, a, b: s >= a,
+    "inRange": lambda s, a, b: s.between(a, b),
+}
+
+
+def _condition(df, col, model):
+    if "conditions" in model:
+        masks = [_condition(df, col, m) for m in model["conditions"]]
+        combine = np.logical_and if model.get("operator") == "AND" else np.logical_or
+        return combine.reduce(masks)
+    values = df[col]
+    kind = model.get("type")
+    if kind == "blank":
+        return values.isna().to_numpy()
+    if kind == "notBlank":
+        return values.notna().to_numpy()
+    if model.get("filterType") == "number":
+        func = _COMPARE_FILTERS[kind]
+        return func(values, model.get("filter"), model.get("filterTo")).to_numpy(
+            dtype=bool, na_value=False
+        )
+    if model.get("filterType") == "date":
+        func = _COMPARE_FILTERS[kind]
+        dates = pd.to_datetime(values, errors="coerce")
+        low, high = (
+            pd.Timestamp(model[k]) if model.get(k) else None
+            for k in ("dateFrom", "dateTo")
+        )
+        return func(dates, low, high).to_numpy(dtype=bool, na_value=False)
+    func = _TEXT_FILTERS[kind]
+    return func(values.astype("string"), str(model.get("filter", ""))).to_numpy(
+        dtype=bool, na_value=False
+    )
+
+
+def row_order(key, request, quick_text=""):
+    """Positions of the rows to show, filtered and sorted as ``request`` asks."""
+    cache_key = (
+        key,
+        json.dumps(request.get("filterModel") or {}, sort_keys=True),
+        json.dumps(request.get("sortModel") or []),
+        quick_text or "",
+    )
+
+    def compute():
+        df = _frames[key]
+        rows = quick_filter(key, quick_text) if quick_text else np.arange(len(df))
+        view = df.iloc[rows]
+        for col, model in (request.get("filterModel") or {}).items():
+            keep = _condition(view, col, model)
+            rows, view = rows[keep], view[keep]
+        sort_model = request.get("sortModel") or []
+        if sort_model:
+            view = view.reset_index(drop=True).sort_values(
+                [s["colId"] for s in sort_model],
+                ascending=[s["sort"] == "asc" for s in sort_model],
+                kind="stable",
+            )
+            rows = rows[view.index.to_numpy()]
+        return rows
+
+    return _orders.get_or_set(cache_key, compute)
+
+
+def serve_rows(key, request, quick_text=""):
+    """Build a ``getRowsResponse`` for a grid's ``getRowsRequest``."""
+    rows = row_order(key, request, quick_text)
+    start, end = request.get("startRow", 0), request.get("endRow", BLOCK_SIZE)
+    block = _frames[key].iloc[rows[start:end]]
+    return {"rowData": block.to_dict("records"), "rowCount": len(rows)}
+
+
+def _register(id_type):
+    if id_type in _registered:
+        return
+    _registered.add(id_type)
+
+    @callback(
+        Output({"type": id_type, "index": MATCH}, "getRowsResponse"),
+        Input({"type": id_type, "index": MATCH}, "getRowsRequest"),
+        State({"type": id_type, "index": MATCH}, "dashGridOptions"),
+        prevent_initial_call=True,
+    )
+    def get_rows(request, options):
+        if not request:
+            return no_update
+        key = (id_type, ctx.triggered_id["index"])
+        return serve_rows(key, request, (options or {}).get("quickFilterText"))
+
+    clientside_callback(
+        """(options) => {
+            try {
+                const id = dash_clientside.callback_context.outputs_list.id
+                dash_ag_grid.getApi(id).purgeInfiniteCache()
+            } catch (e) {}
+            return dash_clientside.no_update
+        }""",
+        Output({"type": id_type, "index": MATCH}, "id"),
+        Input({"type": id_type, "index": MATCH}, "dashGridOptions"),
+        prevent_initial_call=True,
+    )
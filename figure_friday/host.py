@@ -0,0 +1,202 @@
+"""One process serving every week under ``/{year}-{week}``.
+
+``create_host(root)`` finds the ``week-YYYY-WW/app.py`` folders under
+``root`` and lists them, but imports none of them. The first request for a
+week (a page under its prefix, or a Dash request made from one) imports that
+week's module, which loads its datasets and registers its pages and
+callbacks on the host's app. Memory and startup time therefore grow with the
+weeks people visit, not with every week in the repo.
+
+The browser learns a week's callbacks when a page loads, so links between
+weeks are full page loads. The navbar and the home page link to a week
+until it is mounted, then to each of its pages; ``/{year}-{week}`` itself
+redirects to the week's visualizations. Each worker process mounts weeks on its own first
+request for them; the datasets themselves are shared between workers through
+``figure_friday.shared``.
+"""
+
+import contextvars
+import glob
+import importlib.util
+import logging
+import os
+import re
+import sys
+import threading
+from urllib.parse import urlparse
+
+import dash_mantine_components as dmc
+import flask
+from dash import Output, html, no_update, page_registry, register_page
+
+from figure_friday import dash_internals, editor, metrics, shell
+
+logger = logging.getLogger(__name__)
+
+OWNER = "BSd3v"
+ASSETS_ROUTE = "/_ff/assets/"
+LANDING_PAGE = "Visualizations"
+
+_FOLDER = re.compile(r"^week-(\d{4})-(\d{2})$")
+_PATH = re.compile(r"^/(\d{4}-\d{2})(?:/|$)")
+
+
+def discover(root):
+    """``{"YYYY-WW": folder}`` for every week folder with an ``app.py``."""
+    weeks = {}
+    for folder in sorted(glob.glob(os.path.join(root, "week-*"))):
+        match = _FOLDER.match(os.path.basename(folder))
+        if match and os.path.isfile(os.path.join(folder, "app.py")):
+            weeks[f"{match.group(1)}-{match.group(2)}"] = folder
+    return weeks
+
+
+def _title(key):
+    year, week = key.split("-")
+    return f"{year} - Week {week}"
+
+
+class Host:
+    def __init__(self, root):
+        self.weeks = discover(root)
+        self._modules = {}
+        self._lock = threading.Lock()
+        self._cancels = set()
+        ## register_page refuses to run inside a request, so weeks are
+        ## imported in the context the host was created in
+        self._context = contextvars.copy_context()
+        dash_internals.check()
+        shell._hosted = True
+        self.app = shell.create_app(
+            __name__,
+            external_stylesheets=self._stylesheets(),
+            suppress_callback_exceptions=True,
+        )
+        server = self.app.server
+        ## routes can't be added once the server has handled a request
+        editor.register_route(server)
+        server.add_url_rule(
+            f"{ASSETS_ROUTE}<key>/<path:path>", "ff_week_assets", self._asset
+        )
+        server.before_request(self._before_request)
+        register_page(__name__, path="/", name="Figure Friday", layout=self._home)
+        self.app.layout = shell.app_shell(
+            OWNER,
+            "Figure Friday",
+            "FF",
+            links=lambda: [("Figure Friday", "/")] + self._links(),
+            refresh=True,
+            withCssVariables=True,
+            withGlobalClasses=True,
+            withStaticClasses=True,
+        )
+
+    def _pages(self, key):
+        """The pages week ``key`` registered, empty until it is mounted."""
+        return [page for module, page in page_registry.items() if module.startswith(f"{key}.")]
+
+    def _links(self):
+        links = []
+        for key in self.weeks:
+            pages = self._pages(key)
+            if pages:
+                links.extend((f"{_title(key)}: {page['name']}", page["path"]) for page in pages)
+            else:
+                links.append((_title(key), f"/{key}"))
+        return links
+
+    def _home(self, **_):
+        return [
+            html.H2("Weeks"),
+            dmc.Stack(
+                [dmc.Anchor(name, href=href, refresh=True) for name, href in self._links()]
+            ),
+        ]
+
+    def _stylesheets(self):
+        return [
+            f"{ASSETS_ROUTE}{key}/{os.path.basename(path)}"
+            for key, folder in self.weeks.items()
+            for path in sorted(glob.glob(os.path.join(folder, "assets", "*.css")))
+        ]
+
+    def _asset(self, key, path):
+        if key not in self.weeks:
+            flask.abort(404)
+        return flask.send_from_directory(os.path.join(self.weeks[key], "assets"), path)
+
+    def _requested(self):
+        request = flask.request
+        for path in (request.path, urlparse(request.referrer or "").path):
+            match = _PATH.match(path)
+            if match and match.group(1) in self.weeks:
+                return match.group(1)
+        return None
+
+    def _before_request(self):
+        key = self._requested()
+        if key is None:
+            return None
+        self.mount(key)
+        if flask.request.path.rstrip("/") == f"/{key}":
+            pages = self._pages(key)
+            landing = [page for page in pages if page["name"] == LANDING_PAGE] or pages
+            if landing:
+                return flask.redirect(self.app.get_relative_path(landing[0]["path"]))
+        return None
+
+    def mount(self, key):
+        """Import week ``key`` and register its pages and callbacks, once."""
+        if key in self._modules:
+            return self._modules[key]
+        with self._lock:
+            if key not in self._modules:
+                self._modules[key] = self._context.copy().run(self._import, key)
+        return self._modules[key]
+
+    def _import(self, key):
+        name = "week_" + key.replace("-", "_")
+        spec = importlib.util.spec_from_file_location(
+            name, os.path.join(self.weeks[key], "app.py")
+        )
+        module = importlib.util.module_from_spec(spec)
+        callbacks = dash_internals.snapshot(self.app)
+        sys.modules[name] = module
+        try:
+            spec.loader.exec_module(module)
+        except:
+            ## leave nothing half registered, so the next request can retry
+            sys.modules.pop(name, None)
+            dash_internals.restore(self.app, callbacks)
+            for module_name in [m for m in page_registry if m.startswith(f"{key}.")]:
+                del page_registry[module_name]
+            raise
+        self._merge_callbacks()
+        metrics.wrap_callbacks(self.app)
+        logger.info("mounted week %s", key)
+        return module
+
+    def _merge_callbacks(self):
+        for cancel, manager in dash_internals.merge_callbacks(self.app):
+            self._cancel_callback(cancel, manager)
+
+    def _cancel_callback(self, cancel, manager):
+        if str(cancel) in self._cancels:
+            return
+        self._cancels.add(str(cancel))
+
+        @self.app.callback(
+            Output(cancel.component_id, "id"),
+            cancel,
+            prevent_initial_call=True,
+            manager=manager,
+        )
+        def cancel_call(*_):
+            dash_internals.terminate_jobs(flask.request.args.getlist("cancelJob"))
+            return no_update
+
+
+def create_host(root=None):
+    """The host app for the week folders under ``root`` (default: the repo)."""
+    root = root or os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return Host(root).app
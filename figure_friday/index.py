@@ -0,0 +1,105 @@
+"""Precomputed row indexes for filtering a frame many times.
+
+Built once at startup, a ``FrameIndex`` turns the usual pandas filters into
+NumPy work that finds the matching rows without comparing every value:
+
+- ``categories``: columns factorized to integer codes, with the rows of each
+  code stored contiguously so ``isin`` is a handful of slices
+- ``ranges``: columns sorted once so ``between`` is a pair of ``searchsorted``
+  calls and a slice
+- ``bitmaps``: low-cardinality columns with one boolean row mask per value
+
+Each filter yields a boolean row mask and masks combine with ``&``. Those
+masks span the whole frame, so a query still costs a few linear passes over
+plain boolean arrays (allocating, combining, ``take``); what it saves is the
+per-value comparisons and hashing pandas would do on every row.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def _range_keys(values):
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.to_numpy(dtype="datetime64[ns]"), values.isna().to_numpy()
+    keys = values.to_numpy(dtype="float64", na_value=np.nan)
+    return keys, np.isnan(keys)
+
+
+def _range_value(keys, value):
+    if keys.dtype.kind == "M":
+        return np.datetime64(pd.Timestamp(value).tz_localize(None), "ns")
+    return float(value)
+
+
+class FrameIndex:
+    def __init__(self, df, categories=(), ranges=(), bitmaps=()):
+        self.df = df
+        self.size = len(df)
+        self._categories = {}
+        for col in categories:
+            codes, uniques = pd.factorize(df[col])
+            order = np.argsort(codes, kind="stable")
+            counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+            offsets = np.concatenate([[0], np.cumsum(counts)]) + (codes < 0).sum()
+            self._categories[col] = (pd.Index(uniques), order, offsets)
+        self._ranges = {}
+        for col in ranges:
+            keys, missing = _range_keys(df[col])
+            rows = np.flatnonzero(~missing)
+            order = rows[np.argsort(keys[rows], kind="stable")]
+            self._ranges[col] = (keys[order], order)
+        self._bitmaps = {}
+        for col in bitmaps:
+            values = df[col]
+            self._bitmaps[col] = {
+                value: (values == value).to_numpy(dtype=bool, na_value=False)
+                for value in values.dropna().unique()
+            }
+
+    def _mask(self, rows):
+        mask = np.zeros(self.size, dtype=bool)
+        mask[rows] = True
+        return mask
+
+    def isin(self, col, values):
+        uniques, order, offsets = self._categories[col]
+        codes = uniques.get_indexer(pd.Index(list(values)))
+        codes = np.unique(codes[codes >= 0])
+        if not len(codes):
+            return np.zeros(self.size, dtype=bool)
+        return self._mask(
+            np.concatenate([order[offsets[c] : offsets[c + 1]] for c in codes])
+        )
+
+    def between(self, col, low, high):
+        """Rows with ``low <= col <= high``; missing values never match."""
+        keys, order = self._ranges[col]
+        start = np.searchsorted(keys, _range_value(keys, low), side="left")
+        stop = np.searchsorted(keys, _range_value(keys, high), side="right")
+        return self._mask(order[start:stop])
+
+    def equals(self, col, values):
+        bitmaps = self._bitmaps[col]
+        mask = np.zeros(self.size, dtype=bool)
+        for value in values:
+            if value in bitmaps:
+                mask |= bitmaps[value]
+        return mask
+
+    def query(self, isin=None, between=None, equals=None):
+        """AND together the given filters; a ``None`` value skips that column."""
+        mask = np.ones(self.size, dtype=bool)
+        for col, values in (isin or {}).items():
+            if values is not None:
+                mask &= self.isin(col, values)
+        for col, bounds in (between or {}).items():
+            if bounds is not None:
+                mask &= self.between(col, *bounds)
+        for col, values in (equals or {}).items():
+            if values is not None:
+                mask &= self.equals(col, values)
+        return mask
+
+    def take(self, mask):
+        return self.df.iloc[np.flatnonzero(mask)]
@@ -0,0 +1,53 @@
+"""Layouts built on first render instead of at import.
+
+``page_layout(name, version, build)`` wraps a page's layout builder for
+``register_page``: the first render builds the component tree and keeps its
+JSON form, keyed by the page and the version of the data it shows; later
+renders return that JSON without rebuilding or re-walking the components.
+``app_layout(build)`` does the same for ``app.layout``, keeping the built tree
+until its ``version()`` changes.
+
+Anything the rest of the app relies on (callbacks, grid frames, editor data
+sources) must still be registered at import, since a worker may answer a
+callback for a page it never rendered.
+"""
+
+import json
+import threading
+
+from dash._utils import to_json
+
+from figure_friday.cache import LRUCache, register
+
+_pages = register("page-layouts", LRUCache(maxsize=64))
+
+
+def page_layout(name, version, build):
+    """A layout function serving ``build()`` from a cache per ``version``."""
+
+    def layout(**_):
+        return _pages.get_or_set((name, version), lambda: json.loads(to_json(build())))
+
+    return layout
+
+
+def app_layout(build, version=None):
+    """An ``app.layout`` function that builds its tree on the first request.
+
+    With ``version``, the tree is rebuilt whenever ``version()`` returns
+    something new.
+    """
+    built = [None]
+    lock = threading.Lock()
+
+    def layout():
+        key = version() if version else None
+        current = built[0]
+        if current is None or current[0] != key:
+            with lock:
+                current = built[0]
+                if current is None or current[0] != key:
+                    current = built[0] = (key, build())
+        return current[1]
+
+    return layout
@@ -0,0 +1,282 @@
+"""Per-callback timings, payload sizes and errors.
+
+``instrument(app)`` wraps every server-side callback of ``app`` as Dash
+registers it, recording for each one:
+
+- how often it ran and how long it took (p50/p95/p99 over the last
+  ``WINDOW`` calls, plus a running total)
+- the bytes of the requests it answered and of the responses it sent
+- the exceptions it raised, by type, which are also logged with their
+  traceback
+
+along with the hits, misses and size of every cache listed with
+``figure_friday.cache.register``.
+
+``PreventUpdate`` is how callbacks decline to update and isn't an error.
+
+The numbers are served in the Prometheus text format at ``/metrics`` and as
+a table on the ``/debug/callbacks`` page, which only exist when asked for:
+
+- ``FF_METRICS=1`` serves them to requests from the local machine. Behind a
+  reverse proxy every request looks local, so use a token there instead.
+- ``FF_METRICS_TOKEN=<secret>`` serves them to requests carrying the token,
+  as ``Authorization: Bearer <secret>`` or ``?token=<secret>``.
+
+Every worker process keeps
+its own numbers. Background callbacks are timed per request, i.e. for
+starting a job and for each progress poll, not for the job as a whole.
+"""
+
+import functools
+import hmac
+import logging
+import os
+import threading
+import time
+from urllib.parse import parse_qs
+
+import dash_ag_grid as dag
+import flask
+import numpy as np
+from dash import Input, Output, State, callback, dcc, html, register_page
+from dash.exceptions import PreventUpdate
+
+from figure_friday.cache import registered
+from figure_friday.data import _flag
+
+logger = logging.getLogger(__name__)
+
+ROUTE = "/metrics"
+PAGE = "/debug/callbacks"
+WINDOW = 1024
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class CallbackStats:
+    """Counters for one callback; latencies kept in a ring of ``WINDOW``."""
+
+    def __init__(self, name, output):
+        self.name = name
+        self.output = output
+        self.calls = 0
+        self.seconds = 0.0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.exceptions = {}
+        self._latencies = np.zeros(WINDOW)
+        self._lock = threading.Lock()
+
+    def record(self, seconds, request_bytes, response_bytes, exception=None):
+        with self._lock:
+            self._latencies[self.calls % WINDOW] = seconds
+            self.calls += 1
+            self.seconds += seconds
+            self.request_bytes += request_bytes
+            self.response_bytes += response_bytes
+            if exception is not None:
+                kind = type(exception).__name__
+                self.exceptions[kind] = self.exceptions.get(kind, 0) + 1
+
+    def quantiles(self):
+        with self._lock:
+            latencies = self._latencies[: min(self.calls, WINDOW)].copy()
+        if not len(latencies):
+            return {q: 0.0 for q in QUANTILES}
+        return dict(zip(QUANTILES, np.quantile(latencies, QUANTILES)))
+
+    def row(self):
+        quantiles = self.quantiles()
+        return {
+            "callback": self.name,
+            "output": self.output,
+            "calls": self.calls,
+            "p50_ms": round(quantiles[0.5] * 1000, 2),
+            "p95_ms": round(quantiles[0.95] * 1000, 2),
+            "p99_ms": round(quantiles[0.99] * 1000, 2),
+            "total_s": round(self.seconds, 3),
+            "request_kb": round(self.request_bytes / 1024, 1),
+            "response_kb": round(self.response_bytes / 1024, 1),
+            "exceptions": sum(self.exceptions.values()),
+        }
+
+
+_stats = {}
+
+
+def stats():
+    return list(_stats.values())
+
+
+def _wrap(callback_id, cb):
+    ## clientside callbacks have no server function
+    func = cb.get("callback")
+    if func is None or getattr(func, "_ff_metrics", False):
+        return
+    stats = _stats.setdefault(
+        callback_id, CallbackStats(getattr(func, "__name__", callback_id), callback_id)
+    )
+
+    @functools.wraps(func)
+    def timed(*args, **kwargs):
+        request_bytes = flask.request.content_length or 0
+        start = time.perf_counter()
+        try:
+            response = func(*args, **kwargs)
+        except PreventUpdate:
+            stats.record(time.perf_counter() - start, request_bytes, 0)
+            raise
+        except Exception as e:
+            stats.record(time.perf_counter() - start, request_bytes, 0, e)
+            logger.exception("callback %s failed", stats.name)
+            raise
+        stats.record(
+            time.perf_counter() - start,
+            request_bytes,
+            len(response.encode()) if isinstance(response, str) else len(response or b""),
+        )
+        return response
+
+    timed._ff_metrics = True
+    cb["callback"] = timed
+
+
+def wrap_callbacks(app):
+    """Wrap any callbacks added to ``app`` since the last call."""
+    for callback_id, cb in list(app.callback_map.items()):
+        _wrap(callback_id, cb)
+
+
+def enabled():
+    return _flag("FF_METRICS") or bool(os.environ.get("FF_METRICS_TOKEN"))
+
+
+def _allowed(token=None):
+    expected = os.environ.get("FF_METRICS_TOKEN")
+    if expected:
+        header = flask.request.headers.get("Authorization", "")
+        token = token or flask.request.args.get("token")
+        if not token and header.startswith("Bearer "):
+            token = header[len("Bearer ") :]
+        return hmac.compare_digest((token or "").encode(), expected.encode())
+    return _flag("FF_METRICS") and flask.request.remote_addr in ("127.0.0.1", "::1")
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus():
+    """Every callback's numbers in the Prometheus text exposition format."""
+    lines = []
+
+    def family(name, kind, help):
+        lines.append(f"# HELP {name} {help}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    current = stats()
+    labels = {s: f'callback="{_label(s.name)}",output="{_label(s.output)}"' for s in current}
+    family("ff_callback_latency_seconds", "summary", "Callback run time.")
+    for s in current:
+        for q, value in s.quantiles().items():
+            lines.append(f'ff_callback_latency_seconds{{{labels[s]},quantile="{q}"}} {value:.6f}')
+        lines.append(f"ff_callback_latency_seconds_sum{{{labels[s]}}} {s.seconds:.6f}")
+        lines.append(f"ff_callback_latency_seconds_count{{{labels[s]}}} {s.calls}")
+    family("ff_callback_request_bytes_total", "counter", "Bytes of callback requests.")
+    for s in current:
+        lines.append(f"ff_callback_request_bytes_total{{{labels[s]}}} {s.request_bytes}")
+    family("ff_callback_response_bytes_total", "counter", "Bytes of callback responses.")
+    for s in current:
+        lines.append(f"ff_callback_response_bytes_total{{{labels[s]}}} {s.response_bytes}")
+    family("ff_callback_exceptions_total", "counter", "Exceptions raised by callbacks.")
+    for s in current:
+        for kind, count in sorted(s.exceptions.items()):
+            lines.append(
+                f'ff_callback_exceptions_total{{{labels[s]},exception="{_label(kind)}"}} {count}'
+            )
+    caches = {name: cache.info() for name, cache in sorted(registered().items())}
+    for metric, field, kind, help in (
+        ("ff_cache_hits_total", "hits", "counter", "Cache lookups that found a value."),
+        ("ff_cache_misses_total", "misses", "counter", "Cache lookups that found nothing."),
+        ("ff_cache_size", "size", "gauge", "Entries in the cache."),
+    ):
+        family(metric, kind, help)
+        for name, info in caches.items():
+            lines.append(f'{metric}{{cache="{_label(name)}"}} {info[field]}')
+    return "\n".join(lines) + "\n"
+
+
+def cache_rows():
+    rows = []
+    for name, cache in sorted(registered().items()):
+        info = cache.info()
+        lookups = info["hits"] + info["misses"]
+        rows.append(
+            {
+                "cache": name,
+                **info,
+                "hit_rate": round(info["hits"] / lookups, 3) if lookups else None,
+            }
+        )
+    return rows
+
+
+def _serve():
+    if not _allowed():
+        flask.abort(404)
+    return flask.Response(prometheus(), mimetype="text/plain; version=0.0.4")
+
+
+def _page():
+    columns = list(CallbackStats("", "").row())
+    return html.Div(
+        [
+            html.H2("Callbacks"),
+            dcc.Location(id="ff-metrics-location", refresh=False),
+            dcc.Interval(id="ff-metrics-interval", interval=5000),
+            dag.AgGrid(
+                id="ff-metrics-grid",
+                columnDefs=[{"field": c} for c in columns],
+                columnSize="autoSize",
+                dashGridOptions={"animateRows": False},
+            ),
+            html.H2("Caches"),
+            dag.AgGrid(
+                id="ff-metrics-caches",
+                columnDefs=[
+                    {"field": c}
+                    for c in ("cache", "hits", "misses", "hit_rate", "size", "maxsize")
+                ],
+                columnSize="autoSize",
+                dashGridOptions={"animateRows": False},
+            ),
+        ]
+    )
+
+
+def instrument(app):
+    """Record metrics for every callback of ``app``, and serve them if ``enabled()``."""
+    state = {"seen": 0}
+
+    @app.server.before_request
+    def wrap_new_callbacks():
+        ## Dash only fills callback_map on the first request
+        if len(app.callback_map) != state["seen"]:
+            wrap_callbacks(app)
+            state["seen"] = len(app.callback_map)
+
+    if not enabled():
+        return
+    app.server.add_url_rule(ROUTE, "ff_metrics", _serve)
+    register_page("figure_friday.metrics", path=PAGE, name="Callbacks", layout=_page, nav=False)
+
+    @callback(
+        Output("ff-metrics-grid", "rowData"),
+        Output("ff-metrics-caches", "rowData"),
+        Input("ff-metrics-interval", "n_intervals"),
+        State("ff-metrics-location", "search"),
+    )
+    def updateMetrics(_, search):
+        token = parse_qs((search or "").lstrip("?")).get("token", [None])[0]
+        if not _allowed(token):
+            return [], []
+        return [s.row() for s in sorted(stats(), key=lambda s: -s.seconds)], cache_rows()
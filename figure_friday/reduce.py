@@ -0,0 +1,221 @@
+"""Point budgets for large scatter traces.
+
+A scatter with more points than the budget (``FF_POINT_BUDGET``, default
+4000) is reduced before it is sent to the browser and drawn with
+``scattergl``:
+
+- time series (x sorted, numeric or dates) keep the points picked by
+  Largest-Triangle-Three-Buckets, which preserves the shape of the line
+- other scatters are aggregated onto a grid, one marker per occupied cell at
+  the centroid of its points, sized by how many points it holds
+
+``x_range`` restricts a trace to the visible part of the x axis, so zoom
+callbacks can reload it at full resolution once few enough points remain.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+SCATTER_TYPES = ("scatter", "scattergl")
+_POINT_PROPS = ("text", "hovertext", "customdata", "ids", "selectedpoints")
+
+
+def point_budget():
+    return int(os.environ.get("FF_POINT_BUDGET", 4000))
+
+
+def _keys(values):
+    """Float keys for ``values`` and whether they were dates, or ``None``."""
+    values = values if isinstance(values, pd.Series) else pd.Series(np.asarray(values))
+    if pd.api.types.is_bool_dtype(values):
+        return None, False
+    if values.dtype == object:
+        numbers = pd.to_numeric(values, errors="coerce")
+        if numbers.notna().sum() == values.notna().sum():
+            values = numbers
+    if pd.api.types.is_numeric_dtype(values):
+        return values.to_numpy(dtype="float64", na_value=np.nan), False
+    if not pd.api.types.is_datetime64_any_dtype(values):
+        values = pd.to_datetime(values, errors="coerce", format="mixed")
+        if values.isna().all():
+            return None, False
+    values = values.dt.tz_localize(None) if values.dt.tz is not None else values
+    keys = values.to_numpy(dtype="datetime64[ns]").astype("int64").astype("float64")
+    keys[values.isna().to_numpy()] = np.nan
+    return keys, True
+
+
+def _dates(keys):
+    return pd.to_datetime(np.round(keys).astype("int64")).to_numpy()
+
+
+def lttb(x, y, n):
+    """Indices of ``n`` points chosen by Largest-Triangle-Three-Buckets.
+
+    ``x`` must be sorted and neither array may contain NaN.
+    """
+    size = len(x)
+    if n >= size or n < 3:
+        return np.arange(size)
+    edges = np.linspace(1, size - 1, n - 1).astype(np.int64)
+    counts = np.diff(edges)
+    mean_x = np.add.reduceat(x[:-1], edges[:-1]) / counts
+    mean_y = np.add.reduceat(y[:-1], edges[:-1]) / counts
+    mean_x = np.append(mean_x[1:], x[-1])
+    mean_y = np.append(mean_y[1:], y[-1])
+    selected = np.empty(n, dtype=np.int64)
+    selected[0], selected[-1] = 0, size - 1
+    a = 0
+    for i in range(n - 2):
+        start, stop = edges[i], edges[i + 1]
+        area = np.abs(
+            (x[a] - mean_x[i]) * (y[start:stop] - y[a])
+            - (x[a] - x[start:stop]) * (mean_y[i] - y[a])
+        )
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def density(x, y, n):
+    """Centroids and point counts of the occupied cells of a ~``n`` cell grid."""
+    side = max(int(np.sqrt(n)), 1)
+
+    def cells(values):
+        low, high = values.min(), values.max()
+        if high == low:
+            return np.zeros(len(values), dtype=np.int64)
+        scaled = (values - low) / (high - low) * side
+        return np.minimum(scaled.astype(np.int64), side - 1)
+
+    cell = cells(x) * side + cells(y)
+    counts = np.bincount(cell, minlength=side * side)
+    occupied = np.flatnonzero(counts)
+    sum_x = np.bincount(cell, weights=x, minlength=side * side)
+    sum_y = np.bincount(cell, weights=y, minlength=side * side)
+    counts = counts[occupied]
+    return sum_x[occupied] / counts, sum_y[occupied] / counts, counts
+
+
+def _within(keys, dates, x_range):
+    low, high = x_range
+    if dates:
+        low, high = (pd.Timestamp(v).tz_localize(None).value for v in (low, high))
+    return (keys >= float(low)) & (keys <= float(high))
+
+
+def _reduce(x, y, budget, x_range):
+    x_keys, x_dates = _keys(x)
+    y_keys, y_dates = _keys(y)
+    if x_keys is None or y_keys is None:
+        return None, None
+    keep = ~(np.isnan(x_keys) | np.isnan(y_keys))
+    if x_range is not None:
+        keep &= _within(x_keys, x_dates, x_range)
+    rows = np.flatnonzero(keep)
+    x_keys, y_keys = x_keys[rows], y_keys[rows]
+    trace = {"type": "scattergl"}
+    if len(rows) > budget:
+        if np.all(x_keys[1:] >= x_keys[:-1]):
+            picked = lttb(x_keys, y_keys, budget)
+            rows, x_keys, y_keys = rows[picked], x_keys[picked], y_keys[picked]
+        else:
+            x_keys, y_keys, counts = density(x_keys, y_keys, budget)
+            rows = None
+            trace["mode"] = "markers"
+            trace["marker"] = {"size": 4 + 12 * np.sqrt(counts / counts.max())}
+            trace["hovertext"] = [f"{n:,} points" for n in counts]
+    trace["x"] = _dates(x_keys) if x_dates else x_keys
+    trace["y"] = _dates(y_keys) if y_dates else y_keys
+    return trace, rows
+
+
+def reduce_xy(x, y, budget=None, x_range=None):
+    """Scattergl trace properties for ``x``/``y`` holding at most ``budget`` points.
+
+    Returns ``None`` when ``x`` or ``y`` isn't numeric or dates.
+    """
+    return _reduce(x, y, budget or point_budget(), x_range)[0]
+
+
+def _take(value, rows, size):
+    if isinstance(value, dict):
+        return {k: _take(v, rows, size) for k, v in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray)) and len(value) == size:
+        return np.asarray(value, dtype=object if isinstance(value, list) else None)[rows]
+    return value
+
+
+def reduce_trace(trace, budget=None, x_range=None):
+    """Reduced copy of a scatter trace dict, or ``trace`` if it fits the budget."""
+    budget = budget or point_budget()
+    x, y = trace.get("x"), trace.get("y")
+    if trace.get("type", "scatter") not in SCATTER_TYPES or x is None or y is None:
+        return trace
+    if len(x) <= budget and x_range is None:
+        return trace
+    points, rows = _reduce(x, y, budget, x_range)
+    if points is None:
+        return trace
+    if rows is not None:
+        reduced = {k: _take(v, rows, len(x)) for k, v in trace.items()}
+    else:
+        reduced = {k: v for k, v in trace.items() if k not in _POINT_PROPS}
+        points["marker"] = {**(trace.get("marker") or {}), **points["marker"]}
+    reduced.update(points)
+    return reduced
+
+
+def _scatter_size(trace):
+    """Number of points in a scatter trace (dict or graph object), else 0."""
+    get = trace.get if isinstance(trace, dict) else lambda key, default=None: trace[key]
+    if (get("type", "scatter") or "scatter") not in SCATTER_TYPES or get("y") is None:
+        return 0
+    return len(get("x") if get("x") is not None else ())
+
+
+def needs_reduction(figure, budget=None):
+    budget = budget or point_budget()
+    data = figure.data if hasattr(figure, "data") else (figure or {}).get("data") or []
+    return any(_scatter_size(trace) > budget for trace in data)
+
+
+def reduce_figure(figure, budget=None, x_range=None):
+    """Figure dict with every over-budget scatter trace reduced.
+
+    Accepts figure dicts or ``go.Figure``s; traces that fit the budget are
+    passed through untouched. ``x_range`` applies to traces drawn on the
+    primary x axis.
+    """
+    budget = budget or point_budget()
+    if hasattr(figure, "data"):
+        data, layout = figure.data, figure.layout.to_plotly_json()
+    else:
+        data, layout = figure.get("data") or [], figure.get("layout") or {}
+    reduced = []
+    for trace in data:
+        size = _scatter_size(trace)
+        on_x = (trace["xaxis"] if not isinstance(trace, dict) else trace.get("xaxis")) in (None, "x")
+        if size > budget or (size and on_x and x_range is not None):
+            trace = trace if isinstance(trace, dict) else trace.to_plotly_json()
+            trace = reduce_trace(trace, budget, x_range if on_x else None)
+        reduced.append(trace)
+    return {"data": reduced, "layout": {"uirevision": True, **layout}}
+
+
+def zoom_range(relayout, axis="xaxis"):
+    """The x range a ``relayoutData`` event zoomed to.
+
+    ``None`` means the axis was reset to autorange and ``False`` that the
+    event didn't change the axis.
+    """
+    relayout = relayout or {}
+    if relayout.get(f"{axis}.autorange"):
+        return None
+    if f"{axis}.range[0]" in relayout and f"{axis}.range[1]" in relayout:
+        return relayout[f"{axis}.range[0]"], relayout[f"{axis}.range[1]"]
+    if f"{axis}.range" in relayout:
+        return tuple(relayout[f"{axis}.range"])
+    return False
@@ -0,0 +1,66 @@
+"""Full-text quick-filter index over every cell of a frame.
+
+Each cell is lower-cased and split on whitespace; the index keeps the distinct
+tokens (the vocabulary) and, for each token, the rows it appears in. A query
+word matches a row when it is a substring of one of the row's tokens, which is
+what AG Grid's quick filter does client-side, so a query scans the vocabulary
+instead of every cell. Multi-word queries AND their words together.
+"""
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from figure_friday.cache import LRUCache
+
+
+class SearchIndex:
+    def __init__(self, df):
+        self.size = len(df)
+        rows, tokens = [], []
+        positions = pd.RangeIndex(self.size)
+        for col in df.columns:
+            values = df[col].set_axis(positions).dropna()
+            text = pa.array(values.astype(str).to_numpy(dtype=object), type=pa.string())
+            words = pc.utf8_split_whitespace(pc.utf8_lower(text))
+            parents = pc.list_parent_indices(words).to_numpy()
+            rows.append(values.index.to_numpy(dtype=np.int64)[parents])
+            tokens.append(pc.list_flatten(words))
+        rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+        encoded = pc.dictionary_encode(
+            pa.chunked_array(tokens, type=pa.string())
+        ).combine_chunks()
+        codes, vocabulary = encoded.indices.to_numpy(), encoded.dictionary
+        pairs = np.unique(codes.astype(np.int64) * max(self.size, 1) + rows)
+        self._codes = pairs // max(self.size, 1)
+        self._rows = pairs % max(self.size, 1)
+        self._offsets = np.searchsorted(self._codes, np.arange(len(vocabulary) + 1))
+        self.vocabulary = pd.Series(vocabulary.to_pandas(), dtype="string[pyarrow]")
+        self._queries = LRUCache(maxsize=128)
+
+    def _word(self, word):
+        matched = np.flatnonzero(
+            self.vocabulary.str.contains(word, regex=False).to_numpy(dtype=bool)
+        )
+        mask = np.zeros(self.size, dtype=bool)
+        if len(matched) > 64:
+            mask[self._rows[np.isin(self._codes, matched)]] = True
+            return mask
+        for code in matched:
+            mask[self._rows[self._offsets[code] : self._offsets[code + 1]]] = True
+        return mask
+
+    def search(self, text):
+        """Sorted positions of rows matching every word of ``text``."""
+        words = tuple(sorted(set((text or "").lower().split())))
+        if not words:
+            return np.arange(self.size)
+
+        def compute():
+            mask = np.ones(self.size, dtype=bool)
+            for word in words:
+                mask &= self._word(word)
+            return np.flatnonzero(mask)
+
+        return self._queries.get_or_set(words, compute)
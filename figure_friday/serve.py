@@ -0,0 +1,102 @@
+"""Command line entry point for serving a week app.
+
+``python app.py`` serves the app under gunicorn with ``--workers`` processes
+of ``--threads`` threads each. The app module, and so its data, is loaded
+before the workers fork, so every worker shares the same frames
+copy-on-write instead of loading its own. Card figures (``FigureStore``)
+must then be shared too, so with more than one worker they are kept on disk
+under ``FF_CACHE_DIR`` unless ``FF_FIGURE_STORE_DIR`` says where; without
+``diskcache`` the app is served by a single worker instead. On Windows, where gunicorn isn't
+available, waitress serves the app from one multi-threaded process.
+``--debug`` runs the Dash dev server with hot reloading instead.
+
+Each app also exposes ``server`` for running under any WSGI server, e.g.
+``gunicorn --preload app:server``; set ``FF_FIGURE_STORE_DIR`` yourself when
+that runs several workers.
+"""
+
+import argparse
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+
+def _parser():
+    parser = argparse.ArgumentParser(description="Serve a Figure Friday app.")
+    parser.add_argument("--host", default=os.environ.get("HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", 8050)))
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.environ.get("FF_WORKERS", 0)) or os.cpu_count() or 1,
+        help="worker processes (default: FF_WORKERS or one per core)",
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=int(os.environ.get("FF_THREADS", 4)),
+        help="threads per worker (default: FF_THREADS or 4)",
+    )
+    parser.add_argument(
+        "--debug", action="store_true", help="run the Dash dev server with debug tools"
+    )
+    return parser
+
+
+def _shared_stores(workers):
+    """Workers to run, pointing ``FigureStore`` at disk when there are several."""
+    if workers <= 1 or os.environ.get("FF_FIGURE_STORE_DIR"):
+        return workers
+    try:
+        import diskcache  # noqa: F401
+    except ImportError:
+        logger.warning("diskcache unavailable, serving with one worker so card figures stay shared")
+        return 1
+    from figure_friday.background import shared_dir
+
+    os.environ["FF_FIGURE_STORE_DIR"] = shared_dir("figure-store")
+    return workers
+
+
+def _gunicorn(server, options):
+    from gunicorn.app.base import BaseApplication
+
+    class Application(BaseApplication):
+        def load_config(self):
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return server
+
+    Application().run()
+
+
+def serve(app, argv=None):
+    args = _parser().parse_args(argv)
+    if args.debug:
+        app.run(debug=True, host=args.host, port=args.port)
+        return
+    try:
+        _gunicorn(
+            app.server,
+            {
+                "bind": f"{args.host}:{args.port}",
+                "workers": _shared_stores(args.workers),
+                "threads": args.threads,
+                "worker_class": "gthread" if args.threads > 1 else "sync",
+                "preload_app": True,
+            },
+        )
+    except ImportError:
+        try:
+            import waitress
+        except ImportError:
+            raise ImportError(
+                "serving needs gunicorn, or waitress on Windows: "
+                "pip install -r requirements.txt (or run with --debug)"
+            ) from None
+
+        logger.info("gunicorn unavailable, serving with waitress")
+        waitress.serve(app.server, host=args.host, port=args.port, threads=args.threads)
@@ -0,0 +1,31 @@
+"""Per-tab session ids for keying server-side state."""
+
+from dash import Input, Output, State, clientside_callback, dcc
+
+_registered = set()
+
+
+def register_session(id="session-id"):
+    """Register the callback filling ``id`` with a random id, once."""
+    if id in _registered:
+        return
+    _registered.add(id)
+    clientside_callback(
+        """
+            (_, session) => {
+                if (session) {
+                    return window.dash_clientside.no_update
+                }
+                return Date.now().toString(36) + Math.random().toString(36).slice(2)
+            }
+        """,
+        Output(id, "data"),
+        Input(id, "id"),
+        State(id, "data"),
+    )
+
+
+def session_store(id="session-id"):
+    """A sessionStorage ``dcc.Store`` filled with a random id on first load."""
+    register_session(id)
+    return dcc.Store(id=id, storage_type="session")
@@ -0,0 +1,139 @@
+"""Read-only frames shared by every worker through memory-mapped Arrow files.
+
+``share(name, df, version)`` writes a cleaned frame to an uncompressed Arrow
+IPC file under ``{FF_CACHE_DIR}/shared``, named by ``name`` and the
+``version`` of the data it was derived from, and returns a frame read back
+from that file memory-mapped. When the file already exists, e.g. written by
+another worker or an earlier run, it is mapped as is without serializing
+``df`` again. String columns come back as
+``string[pyarrow]`` and numeric columns without missing values as NumPy
+views, both pointing straight at the mapping, so the bytes live once in the
+OS page cache however many workers map the same file. Nullable numeric
+columns are still copied out.
+
+Shared frames are read-only: assign new columns on a ``.copy()`` if needed.
+
+Writing and mapping a name happen under a file lock, and every process that
+maps a file leaves a ``.pid-<pid>`` marker next to it. Files of older
+versions are only deleted once no live process has them mapped.
+"""
+
+import contextlib
+import glob
+import logging
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from figure_friday.data import cache_dir
+
+try:
+    import fcntl
+except ImportError:  # Windows, where mapped files can't be deleted anyway
+    fcntl = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+
+def _types(arrow_type):
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return pd.StringDtype("pyarrow")
+    return None
+
+
+@contextlib.contextmanager
+def _locked(folder, name):
+    if fcntl is None:
+        yield
+        return
+    with open(os.path.join(folder, f".{name}.lock"), "w") as fh:
+        fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def _alive(pid):
+    if psutil is not None:
+        return psutil.pid_exists(pid)
+    if os.name == "nt":
+        ## os.kill would signal the process; assume it's alive
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _in_use(path):
+    """Whether a live process has ``path`` mapped; forgets dead ones."""
+    used = False
+    for marker in glob.glob(f"{glob.escape(path)}.pid-*"):
+        try:
+            pid = int(marker.rsplit("-", 1)[1])
+        except ValueError:
+            continue
+        if _alive(pid):
+            used = True
+        else:
+            with contextlib.suppress(OSError):
+                os.remove(marker)
+    return used
+
+
+def _write(path, df):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    ## pandas keeps string[pyarrow] as large_string; store it that way so
+    ## reading it back doesn't cast (and copy) every string column
+    schema = pa.schema(
+        field.with_type(pa.large_string()) if pa.types.is_string(field.type) else field
+        for field in table.schema
+    ).with_metadata(table.schema.metadata)
+    table = table.cast(schema)
+    ## one record batch, so numeric columns map back as contiguous arrays
+    feather.write_feather(
+        table, tmp, compression="uncompressed", chunksize=max(len(df), 1)
+    )
+    os.replace(tmp, path)
+
+
+def _cleanup(folder, name, keep):
+    for old in glob.glob(os.path.join(folder, f"{glob.escape(name)}-*.arrow")):
+        if old != keep and not _in_use(old):
+            with contextlib.suppress(OSError):
+                os.remove(old)
+
+
+def share(name, df, version):
+    """A memory-mapped, read-only copy of ``df`` shared between processes.
+
+    ``version`` must change whenever what ``df`` holds does, e.g. the
+    ``dataset_version`` of the files it was cleaned from. Falls back to
+    returning ``df`` itself when the file can't be written.
+    """
+    folder = os.path.join(cache_dir(), "shared")
+    path = os.path.join(folder, f"{name}-{version}.arrow")
+    try:
+        os.makedirs(folder, exist_ok=True)
+        with _locked(folder, name):
+            if not os.path.exists(path):
+                _write(path, df)
+            table = feather.read_table(path, memory_map=True)
+            open(f"{path}.pid-{os.getpid()}", "w").close()
+            _cleanup(folder, name, path)
+    except (OSError, pa.ArrowException, ValueError, TypeError):
+        logger.warning("could not share %s; keeping it in process memory", name, exc_info=True)
+        return df
+    return table.to_pandas(split_blocks=True, types_mapper=_types)
@@ -0,0 +1,364 @@
+"""The app shell shared by every week: header, navbar, drawer and theme switch.
+
+A week module asks ``week_app`` for its app and registers its pages with
+``week_page``. Run on its own, the week gets a ``Dash`` app of its own and
+wraps its pages in ``app_shell``. Mounted in the host (``figure_friday.host``)
+it gets the host's app instead, and its pages are registered under
+``/{year}-{week}`` so several weeks can share one process.
+
+Layouts are built on first render (see ``figure_friday.layouts``), so
+nothing here builds components at import; callbacks are registered right
+away.
+
+Ids of the shell itself (``mode``, ``session-id``, ``theme-templates``, ...)
+are the same everywhere; ids a week adds must be unique across weeks, which
+``raw_data_page`` does by suffixing its ids with the week key.
+"""
+
+import dash
+from dash import (
+    ALL,
+    Dash,
+    Input,
+    Output,
+    Patch,
+    State,
+    callback,
+    clientside_callback,
+    dcc,
+    get_app,
+    html,
+    page_container,
+    page_registry,
+    register_page,
+)
+import dash_mantine_components as dmc
+from dash_iconify import DashIconify
+
+from figure_friday.grid import infinite_grid, quick_filter, register_frame
+from figure_friday.layouts import app_layout, page_layout
+from figure_friday.metrics import instrument
+from figure_friday.session import register_session, session_store
+from figure_friday.themes import theme_store
+
+STYLESHEETS = [
+    "https://unpkg.com/@mantine/dates@7/styles.css",
+    "https://unpkg.com/@mantine/code-highlight@7/styles.css",
+    "https://unpkg.com/@mantine/charts@7/styles.css",
+    "https://unpkg.com/@mantine/carousel@7/styles.css",
+    "https://unpkg.com/@mantine/notifications@7/styles.css",
+    "https://unpkg.com/@mantine/nprogress@7/styles.css",
+]
+
+_hosted = False
+
+
+def hosted():
+    """Whether week modules are being mounted in the host."""
+    return _hosted
+
+
+def create_app(name, **kwargs):
+    dash._dash_renderer._set_react_version("18.2.0")
+    ## pages are built on first visit, so ids can't be checked against
+    ## every page up front
+    kwargs.setdefault("suppress_callback_exceptions", True)
+    app = Dash(
+        name,
+        use_pages=True,
+        pages_folder="",
+        external_stylesheets=STYLESHEETS + kwargs.pop("external_stylesheets", []),
+        **kwargs,
+    )
+    instrument(app)
+    return app
+
+
+def week_app(name):
+    """The app a week registers on: the host's when mounted, else a new one."""
+    return get_app() if _hosted else create_app(name)
+
+
+def week_prefix(key):
+    return f"/{key}" if _hosted else ""
+
+
+def week_page(key, name, path, layout, version):
+    """``register_page`` for week ``key``, under its prefix when mounted.
+
+    ``layout()`` builds the page on its first render; the result is reused
+    until the week's data ``version`` changes. Returns the registered layout
+    function.
+    """
+    module = f"{key}.{name}"
+    layout = page_layout(module, version, layout)
+    register_page(module, name=name, path=week_prefix(key) + path, layout=layout)
+    return layout
+
+
+def raw_data_page(key, files, data, attribution):
+    """Builder of the "Raw Data" page: a quick filter over one grid per file."""
+    grid_type, count_type = f"information-{key}", f"information-count-{key}"
+    for f in files:
+        register_frame({"index": f, "type": grid_type}, data[f])
+
+    def layout():
+        return [
+            html.H2("Raw Data"),
+            dcc.Markdown(attribution),
+            dmc.TextInput(
+                label="Quick Filter Text",
+                id=f"filter_raw_data-{key}",
+                placeholder="Type to filter all data sets",
+                debounce=300,
+            ),
+            html.Div(
+                [
+                    html.Div(
+                        [
+                            html.H4(f),
+                            dmc.Text(id={"index": f, "type": count_type}, size="sm"),
+                            infinite_grid({"index": f, "type": grid_type}, data[f]),
+                        ]
+                    )
+                    for f in files
+                ]
+            ),
+        ]
+
+    @callback(
+        Output({"index": ALL, "type": grid_type}, "dashGridOptions", allow_duplicate=True),
+        Output({"index": ALL, "type": count_type}, "children"),
+        Input(f"filter_raw_data-{key}", "value"),
+        prevent_initial_call=True,
+    )
+    def filter_raw_data(v):
+        options = Patch()
+        options["quickFilterText"] = v
+        counts = [
+            f"{len(quick_filter((grid_type, f), v)):,} matching rows" if v else ""
+            for f in files
+        ]
+        return [options] * len(files), counts
+
+    @callback(Output({"index": ALL, "type": grid_type}, "className"), Input("mode", "checked"))
+    def updateClassNames(c):
+        return ["ag-theme-alpine-dark" if c else "ag-theme-alpine"] * len(files)
+
+    return layout
+
+
+def _links(links=None):
+    if callable(links):
+        return list(links())
+    if links is not None:
+        return links
+    return [(pg["title"], pg["path"]) for pg in page_registry.values() if pg.get("nav", True)]
+
+
+def app_shell(owner, title, short_title, links=None, refresh=False, **provider):
+    """An ``app.layout`` function for the ``MantineProvider`` shell.
+
+    ``links`` are ``(title, href)`` pairs for the navbar, by default every
+    registered page but those registered with ``nav=False``, or a function
+    returning them; ``refresh`` makes them full page loads. Other keyword
+    arguments are passed on to ``dmc.MantineProvider``. The shell is built on
+    the first request, and again whenever the links change.
+    """
+    _register_callbacks()
+    register_session()
+    return app_layout(
+        lambda: _shell(owner, title, short_title, _links(links), refresh, provider),
+        version=lambda: tuple(_links(links)),
+    )
+
+
+def _shell(owner, title, short_title, links, refresh, provider):
+    return dmc.MantineProvider(
+        [
+            dmc.AppShell(
+                [
+                    dmc.AppShellHeader(
+                        html.Div(
+                            [
+                                html.H2(f"{owner}"),
+                                html.H1(title, className="mantine-visible-from-md"),
+                                html.H3(short_title, className="mantine-hidden-from-md"),
+                                dmc.Group(
+                                    [
+                                        dmc.Anchor(
+                                            DashIconify(icon="ion:logo-github", width=35),
+                                            href=f"https://github.com/{owner}",
+                                            style={
+                                                "height": "100%",
+                                                "display": "flex",
+                                                "alignItems": "center",
+                                            },
+                                            target="_blank",
+                                            className="mantine-visible-from-sm",
+                                        ),
+                                        dmc.Anchor(
+                                            DashIconify(icon="skill-icons:discord", width=35),
+                                            href="https://discord.com/channels/1247975306472591470",
+                                            style={
+                                                "height": "100%",
+                                                "display": "flex",
+                                                "alignItems": "center",
+                                            },
+                                            target="_blank",
+                                            className="mantine-visible-from-sm",
+                                        ),
+                                        dmc.Anchor(
+                                            html.Img(
+                                                src="https://dash.plotly.com/assets/images/plotly_logo_light.png",
+                                                style={"width": "150px"},
+                                                id="plotly_logo",
+                                            ),
+                                            href="https://dash.plotly.com/",
+                                            style={
+                                                "display": "flex",
+                                                "alignItems": "center",
+                                                "margin": "-15px",
+                                            },
+                                            target="_blank",
+                                            className="mantine-visible-from-sm",
+                                        ),
+                                        dmc.Switch(
+                                            offLabel=DashIconify(icon="radix-icons:moon", width=20),
+                                            onLabel=DashIconify(icon="radix-icons:sun", width=20),
+                                            size="xl",
+                                            id="mode",
+                                            style={"cursor": "pointer"},
+                                        ),
+                                        dmc.Burger(className="mantine-hidden-from-sm", id="display-nav"),
+                                        dcc.Store(id="theme-switch", storage_type="local"),
+                                        theme_store(),
+                                        session_store(),
+                                    ],
+                                    gap=5,
+                                    style={"height": "100%"},
+                                ),
+                            ],
+                            style={
+                                "display": "flex",
+                                "justifyContent": "space-between",
+                                "alignItems": "center",
+                                "paddingLeft": "25px",
+                                "paddingRight": "25px",
+                                "height": "100%",
+                            },
+                        )
+                    ),
+                    dmc.AppShellNavbar(
+                        dmc.Stack(
+                            [
+                                dmc.Anchor(
+                                    name,
+                                    href=href,
+                                    refresh=refresh,
+                                    style={"paddingLeft": "30px", "width": "100%"},
+                                )
+                                for name, href in links
+                            ],
+                            align="center",
+                        )
+                    ),
+                    dmc.AppShellMain(page_container),
+                ],
+                header={"height": 70},
+                padding="xl",
+                zIndex=1400,
+                navbar={
+                    "width": 300,
+                    "breakpoint": "sm",
+                    "collapsed": {"mobile": True},
+                },
+                styles={
+                    "main": {
+                        "paddingTop": "var(--app-shell-header-height)",
+                        "paddingBottom": "25px",
+                    }
+                },
+            ),
+            dmc.Drawer(
+                dmc.Stack(
+                    [
+                        html.Div(
+                            dmc.Anchor(
+                                name,
+                                href=href,
+                                refresh=refresh,
+                                style={"paddingLeft": "30px", "width": "100%", "display": "block"},
+                            ),
+                            id={"index": name, "type": "mobile-nav"},
+                            style={"width": "100%"},
+                        )
+                        for name, href in links
+                    ],
+                    style={"top": "80px", "position": "absolute", "width": "100%"},
+                ),
+                id="nav-drawer",
+            ),
+        ],
+        defaultColorScheme="auto",
+        id="mantine-provider",
+        **provider,
+    )
+
+
+_registered = False
+
+
+def _register_callbacks():
+    global _registered
+    if _registered:
+        return
+    _registered = True
+
+    clientside_callback(
+        """(n) => {
+            return n
+        }""",
+        Output("nav-drawer", "opened"),
+        Input("display-nav", "opened"),
+    )
+
+    clientside_callback(
+        """(_) => {
+            return false
+        }""",
+        Output("display-nav", "opened"),
+        Input({"index": ALL, "type": "mobile-nav"}, "n_clicks"),
+        prevent_initial_call=True,
+    )
+
+    clientside_callback(
+        """(c) => {
+            trg = c ? 'dark' : 'light'
+            document.body.classList = [trg]
+            return [trg, `https://dash.plotly.com/assets/images/plotly_logo_${trg}.png`, c]
+        }""",
+        Output("mantine-provider", "forceColorScheme"),
+        Output("plotly_logo", "src"),
+        Output("theme-switch", "data", allow_duplicate=True),
+        Input("mode", "checked"),
+        prevent_initial_call=True,
+    )
+
+    clientside_callback(
+        """
+            (_, data) => {
+                if (data !== null) {
+                    return [data, data]
+                }
+               return [
+                window.matchMedia('(prefers-color-scheme: dark)').matches ? 'dark' : 'light',
+                window.dash_clientside.no_update
+                ]
+            }
+        """,
+        Output("mode", "checked"),
+        Output("theme-switch", "data"),
+        Input("theme-switch", "id"),
+        State("theme-switch", "data"),
+    )
@@ -0,0 +1,222 @@
+"""Wall time and memory for each phase of an app's startup.
+
+A week module creates a ``StartupProfiler`` before its heavy imports and
+calls ``mark(phase)`` as it moves from one phase to the next (imports, load,
+clean, derive, callbacks); ``finish`` closes the last phase and reports.
+Library code marks its own phases with the module-level ``mark``, which
+applies to whichever profiler is running, and adds timings of its own
+(e.g. each file's fetch and parse) with ``record``.
+
+Pages are built on first render, so building them isn't part of startup.
+Set ``FF_PROFILE_LAYOUTS`` as well to have ``finish`` build them right away
+and report that as ``layout``, apart from the startup phases and totals.
+
+Profiling is off unless ``FF_PROFILE_STARTUP`` is set, since tracing every
+allocation slows startup down. When on, ``finish`` prints a summary table and,
+if ``FF_STARTUP_REPORT`` names a file (or a directory, for one
+``{name}.json`` per app), writes the report there as JSON. Compare a report
+against a baseline with::
+
+    python -m figure_friday.startup report.json baseline.json
+
+which exits non-zero when a phase got slower or hungrier than allowed.
+
+Memory is what ``tracemalloc`` sees, i.e. Python allocations: the peak while
+the phase ran and what it left allocated. Arrow buffers are allocated outside
+of Python's allocator, so the process's maximum RSS is reported too.
+
+This module only imports the standard library, so importing it doesn't
+count towards the imports it measures.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_current = None
+
+
+def _flag(name):
+    return os.environ.get(name, "").lower() in ("1", "true", "yes", "on")
+
+
+def _max_rss():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    ## kilobytes on Linux, bytes on macOS
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+class StartupProfiler:
+    def __init__(self, name, enabled=None):
+        global _current
+        self.name = name
+        self.enabled = _flag("FF_PROFILE_STARTUP") if enabled is None else enabled
+        self.phases = {}
+        self.details = {}
+        self.layout = None
+        self._phase = None
+        if not self.enabled:
+            return
+        self._tracing = not tracemalloc.is_tracing()
+        if self._tracing:
+            tracemalloc.start()
+        _current = self
+        self.mark("imports")
+
+    def mark(self, phase):
+        """End the running phase and start ``phase``."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        current, peak = tracemalloc.get_traced_memory()
+        if self._phase is not None:
+            name, start, allocated = self._phase
+            stats = self.phases.setdefault(
+                name, {"seconds": 0.0, "peak_bytes": 0, "allocated_bytes": 0, "count": 0}
+            )
+            stats["seconds"] += now - start
+            stats["peak_bytes"] = max(stats["peak_bytes"], peak)
+            stats["allocated_bytes"] += current - allocated
+            stats["count"] += 1
+            stats["max_rss_bytes"] = _max_rss()
+        tracemalloc.reset_peak()
+        self._phase = (phase, now, current) if phase else None
+
+    def record(self, name, **seconds):
+        """Report ``seconds`` for ``name`` apart from the phases they ran in."""
+        if not self.enabled:
+            return
+        self.details[name] = seconds
+
+    def finish(self, layouts=()):
+        """Stop and report; with ``FF_PROFILE_LAYOUTS``, build ``layouts`` first.
+
+        The layout build is reported apart from the startup phases.
+        """
+        global _current
+        if not self.enabled or self._phase is None:
+            return
+        if layouts and _flag("FF_PROFILE_LAYOUTS"):
+            self.mark("layout")
+            for layout in layouts:
+                layout()
+            self.mark(None)
+            self.layout = self.phases.pop("layout")
+        self.mark(None)
+        if self._tracing:
+            tracemalloc.stop()
+        if _current is self:
+            _current = None
+        print(self.summary())
+        path = os.environ.get("FF_STARTUP_REPORT")
+        if path:
+            if os.path.isdir(path):
+                path = os.path.join(path, f"{self.name}.json")
+            self.write(path)
+
+    def report(self):
+        report = {
+            "name": self.name,
+            "seconds": sum(p["seconds"] for p in self.phases.values()),
+            "peak_bytes": max((p["peak_bytes"] for p in self.phases.values()), default=0),
+            "max_rss_bytes": _max_rss(),
+            "phases": self.phases,
+        }
+        if self.details:
+            report["details"] = self.details
+        if self.layout is not None:
+            report["layout"] = self.layout
+        return report
+
+    def write(self, path):
+        with open(path, "w") as fh:
+            json.dump(self.report(), fh, indent=2)
+
+    def summary(self):
+        mb = 1 << 20
+        rows = [f"startup of {self.name}", f"{'phase':<12}{'seconds':>9}{'peak MB':>10}{'kept MB':>10}"]
+        for name, p in self.phases.items():
+            rows.append(
+                f"{name:<12}{p['seconds']:>9.3f}{p['peak_bytes'] / mb:>10.1f}"
+                f"{p['allocated_bytes'] / mb:>10.1f}"
+            )
+        report = self.report()
+        rows.append(f"{'total':<12}{report['seconds']:>9.3f}{report['peak_bytes'] / mb:>10.1f}")
+        if self.layout is not None:
+            rows.append(
+                f"{'layout':<12}{self.layout['seconds']:>9.3f}"
+                f"{self.layout['peak_bytes'] / mb:>10.1f}"
+                f"{self.layout['allocated_bytes'] / mb:>10.1f}  (first render, not in total)"
+            )
+        for name, seconds in self.details.items():
+            rows.append(f"  {name}: " + ", ".join(f"{k} {v:.3f}s" for k, v in seconds.items()))
+        if report["max_rss_bytes"]:
+            rows.append(f"max RSS {report['max_rss_bytes'] / mb:.1f} MB")
+        return "\n".join(rows)
+
+
+def mark(phase):
+    """``mark`` on the running profiler, if any."""
+    if _current is not None:
+        _current.mark(phase)
+
+
+def record(name, **seconds):
+    """``record`` on the running profiler, if any."""
+    if _current is not None:
+        _current.record(name, **seconds)
+
+
+def _phases(report):
+    if "layout" in report:
+        return {**report["phases"], "layout": report["layout"]}
+    return report["phases"]
+
+
+def regressions(report, baseline, tolerance=0.25, slack=0.05):
+    """Phases of ``report`` more than ``tolerance`` slower or larger than ``baseline``.
+
+    Slowdowns of less than ``slack`` seconds are ignored.
+    """
+    found = []
+    phases = _phases(report)
+    for name, before in _phases(baseline).items():
+        after = phases.get(name)
+        if after is None:
+            continue
+        if after["seconds"] > max(before["seconds"] * (1 + tolerance), before["seconds"] + slack):
+            found.append(f"{name}: {before['seconds']:.3f}s -> {after['seconds']:.3f}s")
+        if after["peak_bytes"] > before["peak_bytes"] * (1 + tolerance):
+            found.append(f"{name}: peak {before['peak_bytes']:,} -> {after['peak_bytes']:,} bytes")
+    return found
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare a startup report to a baseline.")
+    parser.add_argument("report")
+    parser.add_argument("baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--slack", type=float, default=0.05, help="seconds")
+    args = parser.parse_args(argv)
+    with open(args.report) as fh:
+        report = json.load(fh)
+    with open(args.baseline) as fh:
+        baseline = json.load(fh)
+    found = regressions(report, baseline, args.tolerance, args.slack)
+    for line in found:
+        print(line)
+    return 1 if found else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
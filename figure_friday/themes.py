@@ -0,0 +1,60 @@
+"""Light and dark figure templates, serialized once.
+
+``template(dark)`` returns the serialized ``plotly_white``/``plotly_dark``
+template; the same dict is reused for every figure, so attaching it costs
+nothing. ``theme_store`` ships both templates to the browser once, and
+``theme_toggle`` swaps them into figures client-side when the color scheme
+switch changes, without a server round trip. Figures built server-side
+should still carry ``template(dark)`` for the mode they were requested in;
+the toggle corrects any that raced a switch.
+
+Build figures with ``template="none"`` and attach ``template(dark)`` to the
+serialized layout, so plotly doesn't resolve and copy a template per figure.
+"""
+
+import plotly.io as pio
+from dash import Input, Output, State, clientside_callback, dcc
+
+TEMPLATES = {"light": "plotly_white", "dark": "plotly_dark"}
+
+_templates = {}
+
+
+def template(dark):
+    name = "dark" if dark else "light"
+    if name not in _templates:
+        _templates[name] = pio.templates[TEMPLATES[name]].to_plotly_json()
+    return _templates[name]
+
+
+def theme_store(id="theme-templates"):
+    return dcc.Store(id=id, data={"light": template(False), "dark": template(True)})
+
+
+def theme_toggle(graph_ids, mode_id="mode", store_id="theme-templates"):
+    """Keep the figures of ``graph_ids`` on the template ``mode_id`` selects.
+
+    Runs client-side whenever the switch flips or a figure changes, and only
+    re-renders figures whose template doesn't match.
+    """
+    clientside_callback(
+        """(checked, ...args) => {
+            const templates = args.pop()
+            const template = templates[checked ? "dark" : "light"]
+            const expected = JSON.stringify(template)
+            return args.map((figure) => {
+                if (!figure || !figure.layout) {
+                    return dash_clientside.no_update
+                }
+                if (JSON.stringify(figure.layout.template) === expected) {
+                    return dash_clientside.no_update
+                }
+                return {...figure, layout: {...figure.layout, template}}
+            })
+        }""",
+        [Output(id, "figure", allow_duplicate=True) for id in graph_ids],
+        Input(mode_id, "checked"),
+        [Input(id, "figure") for id in graph_ids],
+        State(store_id, "data"),
+        prevent_initial_call="initial_duplicate",
+    )
@@ -0,0 +1,127 @@
+"""Treemaps built from pre-aggregated node tables.
+
+``px.treemap`` regroups the raw rows at every level of ``path`` each time it
+is called. ``TreemapEngine`` does that grouping once: every node of the
+hierarchy gets its id, label and parent up front, and every row is mapped to
+its leaf. A filter is then a row mask, and the node values are ``bincount``
+sums over the rows it selects.
+
+Sums are updated incrementally: the engine remembers the last mask it
+aggregated and, when a new mask differs from it in fewer rows than it
+selects, only adds and subtracts the rows that changed. That state lives in
+the process; pass ``incremental=False`` where calls run in throwaway worker
+processes (background callbacks), which would only ever see it empty.
+
+Node colors match ``px.treemap(values=col, color=col)``: the value-weighted
+mean of ``col`` over the rows under the node.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+
+class TreemapEngine:
+    def __init__(self, df, path, values, incremental=True):
+        self.size = len(df)
+        self.incremental = incremental
+        self.values = values
+        weights = df[values].to_numpy(dtype="float64", na_value=np.nan)
+        leaf = df.groupby(list(path), sort=False, dropna=True).ngroup().to_numpy()
+        self._rows = (leaf >= 0) & ~np.isnan(weights)
+        _, first, leaf[self._rows] = np.unique(
+            leaf[self._rows], return_index=True, return_inverse=True
+        )
+        leaf[~self._rows] = 0
+        self._leaf = leaf
+        self._weights = np.where(self._rows, weights, 0.0)
+
+        names = df.iloc[np.flatnonzero(self._rows)[first]][list(path)].astype(str)
+        n_leaves = len(names)
+        self._levels = []
+        parent_ids = np.full(n_leaves, "", dtype=object)
+        for depth in range(len(path)):
+            labels = names.iloc[:, depth].to_numpy(dtype=object)
+            ids = labels if depth == 0 else parent_ids + "/" + labels
+            codes, uniques = pd.factorize(ids)
+            first = np.unique(codes, return_index=True)[1]
+            self._levels.append(
+                {
+                    "leaf_to_node": codes,
+                    "ids": np.asarray(uniques, dtype=object),
+                    "labels": labels[first],
+                    "parents": parent_ids[first],
+                }
+            )
+            parent_ids = ids
+        self._n_leaves = n_leaves
+        self._state = None
+        self._lock = threading.Lock()
+
+    def _sums(self, rows, sign=1.0):
+        leaf = self._leaf[rows]
+        weights = self._weights[rows]
+        return (
+            sign * np.bincount(leaf, minlength=self._n_leaves),
+            sign * np.bincount(leaf, weights=weights, minlength=self._n_leaves),
+            sign * np.bincount(leaf, weights=weights**2, minlength=self._n_leaves),
+        )
+
+    def aggregate(self, mask):
+        """Per-leaf row counts, sums and sums of squares for the rows in ``mask``."""
+        mask = np.asarray(mask, dtype=bool) & self._rows
+        if not self.incremental:
+            return self._sums(mask)
+        with self._lock:
+            state = self._state
+        if state is not None:
+            last, sums = state
+            added, removed = mask & ~last, last & ~mask
+            if added.sum() + removed.sum() < mask.sum():
+                plus, minus = self._sums(added), self._sums(removed, -1.0)
+                sums = tuple(s + p + m for s, p, m in zip(sums, plus, minus))
+                with self._lock:
+                    self._state = (mask, sums)
+                return sums
+        sums = self._sums(mask)
+        with self._lock:
+            self._state = (mask, sums)
+        return sums
+
+    def trace(self, mask, **kwargs):
+        """``go.Treemap`` of the rows in ``mask``, leaves first."""
+        counts, totals, squares = self.aggregate(mask)
+        columns = {"ids": [], "labels": [], "parents": [], "values": [], "colors": []}
+        for level in reversed(self._levels):
+            n = len(level["ids"])
+            codes = level["leaf_to_node"]
+            count = np.bincount(codes, weights=counts, minlength=n)
+            total = np.bincount(codes, weights=totals, minlength=n)
+            square = np.bincount(codes, weights=squares, minlength=n)
+            keep = np.round(count) > 0
+            columns["ids"].append(level["ids"][keep])
+            columns["labels"].append(level["labels"][keep])
+            columns["parents"].append(level["parents"][keep])
+            columns["values"].append(total[keep])
+            columns["colors"].append(
+                np.divide(
+                    square[keep], total[keep],
+                    out=np.full(keep.sum(), np.nan), where=total[keep] != 0,
+                )
+            )
+        columns = {k: np.concatenate(v) for k, v in columns.items()}
+        return go.Treemap(
+            ids=columns["ids"],
+            labels=columns["labels"],
+            parents=columns["parents"],
+            values=columns["values"],
+            branchvalues="total",
+            marker={"colors": columns["colors"], "coloraxis": "coloraxis"},
+            hovertemplate=(
+                "%{label}<br>" + self.values + "=%{value}<br>parent=%{parent}<br>"
+                "id=%{id}<extra></extra>"
+            ),
+            **kwargs,
+        )
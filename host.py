@@ -0,0 +1,23 @@
+### serve every week from one process, each mounted on first use
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from figure_friday.startup import StartupProfiler
+
+startup = StartupProfiler("host")
+
+from figure_friday.host import create_host
+from figure_friday.serve import serve
+
+logging.basicConfig(level=logging.INFO)
+
+startup.mark("app")
+app = create_host()
+server = app.server
+
+startup.finish()
+
+if __name__ == "__main__":
+    serve(app)
@@ -0,0 +1,94 @@
+import json
+
+import numpy as np
+import plotly.express as px
+from dash import no_update
+from plotly.utils import PlotlyJSONEncoder
+
+from figure_friday.diff import diff_patch
+
+
+def apply(figure, patch):
+    """``figure`` with the Assign and Delete operations of ``patch`` applied."""
+    figure = json.loads(json.dumps(figure, cls=PlotlyJSONEncoder))
+    for op in patch.to_plotly_json()["operations"]:
+        *path, last = op["location"]
+        target = figure
+        for key in path:
+            target = target[key]
+        if op["operation"] == "Assign":
+            target[last] = json.loads(json.dumps(op["params"]["value"], cls=PlotlyJSONEncoder))
+        elif op["operation"] == "Delete":
+            del target[last]
+        else:
+            raise AssertionError(f"unexpected operation {op['operation']}")
+    return figure
+
+
+def assert_reproduces(old, new):
+    patch = diff_patch(old, new)
+    assert patch is not no_update
+    assert apply(old, patch) == json.loads(json.dumps(new, cls=PlotlyJSONEncoder))
+
+
+def test_equal_figures():
+    figure = {"data": [{"type": "bar", "x": np.arange(3.0)}], "layout": {"title": "a"}}
+    same = {"data": [{"type": "bar", "x": np.arange(3.0)}], "layout": {"title": "a"}}
+    assert diff_patch(figure, same) is no_update
+
+
+def test_nested_traces():
+    old = {
+        "data": [
+            {"type": "scatter", "x": [1, 2], "marker": {"color": "red", "size": 4}},
+            {"type": "bar", "x": ["a", "b"], "y": [3, 4], "name": "bars"},
+        ],
+        "layout": {"xaxis": {"range": [0, 1]}, "title": {"text": "old"}},
+    }
+    new = {
+        "data": [
+            {"type": "scatter", "x": [1, 2], "marker": {"color": "blue", "size": 4}},
+            {"type": "bar", "x": ["a", "b"], "y": [3, 5], "name": "bars"},
+        ],
+        "layout": {"xaxis": {"range": [0, 2]}, "title": {"text": "old"}},
+    }
+    assert_reproduces(old, new)
+    operations = diff_patch(old, new).to_plotly_json()["operations"]
+    assert {tuple(op["location"]) for op in operations} == {
+        ("data", 0, "marker", "color"),
+        ("data", 1, "y"),
+        ("layout", "xaxis", "range"),
+    }
+
+
+def test_trace_count_changes():
+    old = {"data": [{"type": "bar", "y": [1]}], "layout": {}}
+    new = {"data": [{"type": "bar", "y": [1]}, {"type": "bar", "y": [2]}], "layout": {}}
+    assert_reproduces(old, new)
+    assert_reproduces(new, old)
+
+
+def test_deleted_keys():
+    old = {"data": [{"type": "bar", "y": [1], "name": "a"}], "layout": {"title": "t", "height": 300}}
+    new = {"data": [{"type": "bar", "y": [1]}], "layout": {"title": "t"}}
+    assert_reproduces(old, new)
+
+
+def test_ndarray_equality():
+    values = np.array([1.0, np.nan, 3.0])
+    old = {"data": [{"values": values, "ids": np.array(["a", "b", "c"], dtype=object)}]}
+    same = {"data": [{"values": values.copy(), "ids": np.array(["a", "b", "c"], dtype=object)}]}
+    assert diff_patch(old, same) is no_update
+    assert diff_patch({"data": [{"x": [1.0, 2.0]}]}, {"data": [{"x": np.array([1.0, 2.0])}]}) is no_update
+
+    for changed in (np.array([1.0, 2.0, 3.0]), np.array([1.0, np.nan]), np.array(["1", "", "3"])):
+        new = {"data": [{"values": changed, "ids": old["data"][0]["ids"]}]}
+        assert_reproduces(old, new)
+
+
+def test_plotly_figures():
+    df = px.data.tips()
+    old = px.scatter(df, x="total_bill", y="tip", color="day").to_dict()
+    new = px.scatter(df[df["size"] > 2], x="total_bill", y="tip", color="day").to_dict()
+    new["layout"]["title"] = {"text": "bigger tables"}
+    assert_reproduces(old, new)
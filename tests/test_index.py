@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from figure_friday.index import FrameIndex
+
+
+@pytest.fixture(scope="module")
+def df():
+    rng = np.random.default_rng(0)
+    n = 2000
+    team = rng.choice(np.array(["a", "b", "c", "d", None], dtype=object), n)
+    attendance = rng.integers(0, 1000, n).astype("float64")
+    attendance[rng.random(n) < 0.1] = np.nan
+    date = pd.Series(pd.Timestamp("2020-01-01") + pd.to_timedelta(rng.integers(0, 365, n), unit="D"))
+    date[rng.random(n) < 0.1] = pd.NaT
+    return pd.DataFrame(
+        {
+            "team": team,
+            "opponent": rng.choice(["a", "b", "c", "d"], n),
+            "attendance": attendance,
+            "date": date,
+            "tier": rng.integers(1, 3, n),
+        }
+    )
+
+
+@pytest.fixture(scope="module")
+def index(df):
+    return FrameIndex(
+        df, categories=["team", "opponent"], ranges=["attendance", "date"], bitmaps=["tier"]
+    )
+
+
+@pytest.mark.parametrize("values", [["a"], ["b", "d"], ["a", "zz"], ["zz"], []])
+def test_isin(df, index, values):
+    np.testing.assert_array_equal(index.isin("team", values), df["team"].isin(values).to_numpy())
+
+
+@pytest.mark.parametrize(
+    "col, low, high",
+    [
+        ("attendance", 100, 500),
+        ("attendance", 500, 500),
+        ("attendance", -10, 10_000),
+        ("attendance", 600, 100),
+        ("date", "2020-03-01", "2020-06-30"),
+        ("date", "2020-03-01T12:00:00", "2020-03-02"),
+        ("date", "2019-01-01", "2019-12-31"),
+    ],
+)
+def test_between(df, index, col, low, high):
+    bounds = (pd.Timestamp(low), pd.Timestamp(high)) if col == "date" else (low, high)
+    expected = df[col].between(*bounds).to_numpy()
+    np.testing.assert_array_equal(index.between(col, low, high), expected)
+
+
+@pytest.mark.parametrize("values", [[1], [1, 2], [3], []])
+def test_equals(df, index, values):
+    np.testing.assert_array_equal(index.equals("tier", values), df["tier"].isin(values).to_numpy())
+
+
+def test_query(df, index):
+    mask = index.query(
+        isin={"team": ["a", "c"], "opponent": None},
+        between={"attendance": (200, 800), "date": ("2020-02-01", "2020-11-30")},
+        equals={"tier": [2]},
+    )
+    expected = (
+        df["team"].isin(["a", "c"])
+        & df["attendance"].between(200, 800)
+        & df["date"].between(pd.Timestamp("2020-02-01"), pd.Timestamp("2020-11-30"))
+        & (df["tier"] == 2)
+    )
+    np.testing.assert_array_equal(mask, expected.to_numpy())
+    pd.testing.assert_frame_equal(index.take(mask), df[expected])
+    assert index.query().all()
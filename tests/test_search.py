@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from figure_friday.search import SearchIndex
+
+
+@pytest.fixture(scope="module")
+def df():
+    rng = np.random.default_rng(0)
+    n = 500
+    score = rng.integers(0, 5, n).astype("float64")
+    score[rng.random(n) < 0.1] = np.nan
+    return pd.DataFrame(
+        {
+            "team": rng.choice(["Arsenal Women", "Chelsea FC Women", "Everton", None], n),
+            "match": [f"M-{i} word{i % 150}" for i in range(n)],
+            "score": score,
+            "date": pd.Timestamp("2021-01-01") + pd.to_timedelta(rng.integers(0, 60, n), unit="D"),
+        }
+    )
+
+
+def naive(df, text):
+    """Rows where every word of ``text`` is a substring of one of their tokens."""
+    words = (text or "").lower().split()
+    matches = []
+    for position, row in enumerate(df.itertuples(index=False)):
+        tokens = [
+            token
+            for value in row
+            if not pd.isna(value)
+            for token in str(value).lower().split()
+        ]
+        if all(any(word in token for token in tokens) for word in words):
+            matches.append(position)
+    return np.array(matches, dtype=np.int64)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        "arsenal",
+        "WOMEN",
+        "fc women",
+        "women fc",
+        "m-1",
+        "word",
+        "word1 m-10",
+        "3.0",
+        "2021-02",
+        "nan",
+        "zzz",
+        "arsenal women",
+    ],
+)
+def test_matches_substring_scan(df, text):
+    index = SearchIndex(df)
+    np.testing.assert_array_equal(index.search(text), naive(df, text))
+
+
+def test_repeated_queries(df):
+    index = SearchIndex(df)
+    for text in ["everton", "Everton", "word", "everton"]:
+        np.testing.assert_array_equal(index.search(text), naive(df, text))
+
+
+def test_empty_frame():
+    index = SearchIndex(pd.DataFrame({"a": pd.Series([], dtype=object)}))
+    assert len(index.search("x")) == 0
+    assert len(index.search("")) == 0
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import pytest
+
+from figure_friday.treemap import TreemapEngine
+
+PATH = ["team", "opponent", "season"]
+
+
+@pytest.fixture(scope="module")
+def df():
+    rng = np.random.default_rng(0)
+    n = 3000
+    attendance = rng.integers(1, 5000, n).astype("float64")
+    attendance[rng.random(n) < 0.05] = np.nan
+    return pd.DataFrame(
+        {
+            "team": rng.choice([f"Team {i}" for i in range(8)], n),
+            "opponent": rng.choice([f"Team {i}" for i in range(8)], n),
+            "season": rng.choice(["2021", "2022", "2023"], n),
+            "attendance": attendance,
+        }
+    )
+
+
+def nodes(trace):
+    return {
+        id: (label, parent, value, color)
+        for id, label, parent, value, color in zip(
+            trace.ids, trace.labels, trace.parents, trace.values, trace.marker.colors
+        )
+    }
+
+
+def assert_matches_px(trace, rows):
+    expected = px.treemap(
+        rows.dropna(subset=["attendance"]), path=PATH, values="attendance", color="attendance"
+    ).data[0]
+    actual, expected = nodes(trace), nodes(expected)
+    assert actual.keys() == expected.keys()
+    for id, (label, parent, value, color) in expected.items():
+        assert actual[id][:2] == (label, parent)
+        assert actual[id][2] == pytest.approx(value)
+        assert actual[id][3] == pytest.approx(color)
+
+
+@pytest.mark.parametrize("incremental", [True, False])
+def test_matches_px_treemap(df, incremental):
+    engine = TreemapEngine(df, path=PATH, values="attendance", incremental=incremental)
+    masks = [
+        np.ones(len(df), dtype=bool),
+        (df["team"] != "Team 0").to_numpy(),
+        (df["team"] != "Team 0").to_numpy() & (df["season"] != "2021").to_numpy(),
+        df["opponent"].isin(["Team 1", "Team 2"]).to_numpy(),
+        np.ones(len(df), dtype=bool),
+    ]
+    ## in this order, the second and third masks are aggregated incrementally
+    for mask in masks:
+        assert_matches_px(engine.trace(mask), df[mask])
+
+
+def test_empty_mask(df):
+    engine = TreemapEngine(df, path=PATH, values="attendance")
+    assert len(engine.trace(np.zeros(len(df), dtype=bool)).ids) == 0
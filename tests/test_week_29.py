@@ -0,0 +1,51 @@
+import pytest
+from dash import Patch, no_update
+
+from benchmarks import synthetic
+from benchmarks.bench_callbacks import load_week
+
+
+@pytest.fixture(scope="module")
+def app(tmp_path_factory):
+    root = tmp_path_factory.mktemp("week-29")
+    synthetic.write_week(
+        str(root / "source"),
+        "2024",
+        "29",
+        {
+            "ewf_appearances.csv": synthetic.ewf_appearances(200),
+            "ewf_matches.csv": synthetic.ewf_matches(200),
+            "ewf_standings.csv": synthetic.ewf_standings(),
+        },
+    )
+    with pytest.MonkeyPatch.context() as env:
+        env.setenv("FF_DATA_SOURCE", str(root / "source"))
+        env.setenv("FF_CACHE_DIR", str(root / "cache"))
+        env.setenv("FF_OFFLINE", "1")
+        env.delenv("FF_BACKGROUND", raising=False)
+        yield load_week("29")
+
+
+def test_update_treemap_empty_selection(app):
+    home = app.home_team
+    values = [
+        [-10, -5],
+        [str(home["date"].min()), str(home["date"].max())],
+        "All",
+        [],
+        [],
+    ]
+    figs = app.updateTreemap(lambda *_: None, values, False, None, "session")
+    assert len(figs) == 4
+    assert all(isinstance(fig, Patch) for fig in figs[:3])
+    assert figs[3]["key"]
+
+
+def test_half_picked_date_range(app):
+    home = app.home_team
+    attendance = [float(home["attendance"].min()), float(home["attendance"].max())]
+    values = [attendance, [str(home["date"].min()), None], "All", [], []]
+    figs = app.updateTreemap(lambda *_: None, values, False, None, "session")
+    assert figs == [no_update] * 4
+    relayout = {"xaxis.range[0]": "2015-01-01", "xaxis.range[1]": "2016-01-01"}
+    assert app.zoomAttendance(relayout, *values) == (no_update, no_update)
@@ -1,483 +1,390 @@
 ### import libraries
-import traceback
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from figure_friday.startup import StartupProfiler
+
+startup = StartupProfiler("week-2024-29")
 
 import dash
 from dash import *
 import pandas as pd
-import dash_ag_grid as dag
 import dash_mantine_components as dmc
 import dash_bootstrap_components as dbc
-from dash_iconify import DashIconify
-import plotly.express as px
 import plotly.graph_objects as go
-import plotly.io as pio
+
+from figure_friday.background import (
+    background_callback,
+    running_in_background,
+    shared_cache,
+    shared_dir,
+)
+from figure_friday.cache import register, selection_key
+from figure_friday.cleaning import canonical_names, normalize_numeric
+from figure_friday.coalesce import Coalescer, debounced_inputs
+from figure_friday.data import dataset_version, load_files
+from figure_friday.diff import diff_patch
+from figure_friday.index import FrameIndex
+from figure_friday.reduce import reduce_xy, zoom_range
+from figure_friday.serve import serve
+from figure_friday.shared import share
+from figure_friday.shell import app_shell, hosted, raw_data_page, week_app, week_page
+from figure_friday.themes import template, theme_toggle
+from figure_friday.treemap import TreemapEngine
 
 ### import data
+logging.basicConfig(level=logging.INFO)
 owner = "BSd3v"
-data = {}
 week = "29"
 year = "2024"
-base_url = (
-    f"https://raw.githubusercontent.com/plotly/Figure-Friday/main/{year}/week-{week}/"
-)
+week_key = f"{year}-{week}"
 attribution = """The English Women's Football (EWF) Database, May 2024, https://github.com/probjects/ewf-database."""
 
 files = ["ewf_appearances.csv", "ewf_matches.csv", "ewf_standings.csv"]
-for f in files:
-    if ".csv" in f.lower():
-        data[f] = pd.read_csv(f"{base_url}/{files[0]}")
-    else:
-        data[f] = pd.read_excel(f"{base_url}/{files[0]}")
+data = load_files(year, week, files)
+version = dataset_version(year, week, files)
 
 
 ### dash app
-stylesheets = [
-    "https://unpkg.com/@mantine/dates@7/styles.css",
-    "https://unpkg.com/@mantine/code-highlight@7/styles.css",
-    "https://unpkg.com/@mantine/charts@7/styles.css",
-    "https://unpkg.com/@mantine/carousel@7/styles.css",
-    "https://unpkg.com/@mantine/notifications@7/styles.css",
-    "https://unpkg.com/@mantine/nprogress@7/styles.css",
-]
-
-dash._dash_renderer._set_react_version("18.2.0")
-
-app = Dash(__name__, use_pages=True, pages_folder="", external_stylesheets=stylesheets)
+startup.mark("app")
+app = week_app(__name__)
+server = app.server
 
 
 ### visualizations
-
+startup.mark("clean")
 for f in files:
-    data[f]["attendance"] = data[f]["attendance"].map(
-        lambda x: int(str(x).replace(",", "")) if x and str(x) != "nan" else None
-    )
+    normalize_numeric(data[f], ["attendance"])
 
 default_layout = {"margin": {"r": 0, "l": 0, "b": 0, "t": 35}}
 
-home_team = data[files[1]][data[files[1]]["home_team"] == 1].copy()
-away_team = data[files[1]][data[files[1]]["away_team"] == 1].copy()
+home_team = data[files[0]][data[files[0]]["home_team"] == 1].copy()
+away_team = data[files[0]][data[files[0]]["away_team"] == 1].copy()
 home_team["date"] = pd.to_datetime(home_team["date"])
 
 ## fix names
-for i, row in home_team.iterrows():
-    home_team.loc[i, "team_name"] = home_team[
-        home_team["team_id"] == row["team_id"]
-    ].iloc[-1]["team_name"]
-    home_team.loc[i, "opponent_name"] = home_team[
-        home_team["opponent_id"] == row["opponent_id"]
-    ].iloc[-1]["opponent_name"]
-
-figures = dmc.Grid(
-    [
-        dmc.GridCol(
-            [
-                dcc.Graph(figure=go.Figure(), id="home_attendance_treemap"),
-            ]
-        ),
-        dmc.GridCol(
-            [
-                "Match Attendance Range",
-                dmc.RangeSlider(
-                    value=[
-                        home_team["attendance"].min(),
-                        home_team["attendance"].max(),
-                    ],
-                    min=home_team["attendance"].min(),
-                    max=home_team["attendance"].max(),
-                    id="attendance_range",
-                ),
-                dmc.DatePicker(
-                    label="Match Date Range",
-                    value=[home_team["date"].min(), home_team["date"].max()],
-                    minDate=home_team["date"].min(),
-                    maxDate=home_team["date"].max(),
-                    id="date_range",
-                    type="range",
-                    numberOfColumns=2,
-                ),
-                dmc.RadioGroup(
-                    children=dmc.Group(
-                        [dmc.Radio(k, value=k) for k in ["All", "1", "2"]], my=10
+canonical_names(home_team, "team_id", "team_name")
+canonical_names(home_team, "opponent_id", "opponent_name")
+
+startup.mark("derive")
+## cleaned frames are read-only from here on; map them from one shared file
+## per frame so every worker reads the same pages
+for f in files:
+    data[f] = share(f"{year}-{week}-{os.path.splitext(f)[0]}", data[f], version)
+home_team = share(f"{year}-{week}-home_team", home_team, version)
+away_team = share(f"{year}-{week}-away_team", away_team, version)
+
+def figures():
+    return dmc.Grid(
+        [
+            dmc.GridCol(
+                [
+                    dcc.Graph(figure=go.Figure(), id="home_attendance_treemap"),
+                    dcc.Store(id="figure-state"),
+                    dcc.Store(id="filter-values"),
+                ]
+            ),
+            dmc.GridCol(
+                [
+                    "Match Attendance Range",
+                    dmc.RangeSlider(
+                        value=[
+                            home_team["attendance"].min(),
+                            home_team["attendance"].max(),
+                        ],
+                        min=home_team["attendance"].min(),
+                        max=home_team["attendance"].max(),
+                        id="attendance_range",
                     ),
-                    id="match_tier",
-                    value="All",
-                    label="Match Tier",
-                    size="sm",
-                    mb=10,
-                ),
-                dmc.MultiSelect(
-                    id="home_teams",
-                    data=sorted(home_team["team_name"].unique().tolist()),
-                    clearable=True,
-                    label="Home Teams",
-                ),
-                dmc.MultiSelect(
-                    id="away_teams",
-                    data=sorted(home_team["opponent_name"].unique().tolist()),
-                    clearable=True,
-                    label="Away Teams",
-                ),
-            ],
-            span=2,
-            className="filter-card",
-            style={"padding": "15px"},
-        ),
-        dmc.GridCol(
-            [
-                dmc.Group(
-                    [
-                        dcc.Graph(
-                            figure=go.Figure(),
-                            id="attendance_time",
-                            style={"height": "100%"},
-                        ),
-                        html.Div(
-                            [
-                                dcc.Graph(
-                                    figure=go.Figure(),
-                                    id="most_attendance",
-                                    style={"height": "100%"},
-                                )
-                            ],
-                            style={
-                                "display": "flex",
-                                "flexDirection": "column",
-                                "height": "100%",
-                            },
+                    dmc.DatePicker(
+                        label="Match Date Range",
+                        value=[home_team["date"].min(), home_team["date"].max()],
+                        minDate=home_team["date"].min(),
+                        maxDate=home_team["date"].max(),
+                        id="date_range",
+                        type="range",
+                        numberOfColumns=2,
+                    ),
+                    dmc.RadioGroup(
+                        children=dmc.Group(
+                            [dmc.Radio(k, value=k) for k in ["All", "1", "2"]], my=10
                         ),
-                    ],
-                    style={
-                        "height": "300px",
-                        "maxHeight": "300px",
-                        "overflow": "hidden",
-                        "padding": "15px",
-                    },
-                )
-            ],
-            span=10,
-        ),
-    ]
+                        id="match_tier",
+                        value="All",
+                        label="Match Tier",
+                        size="sm",
+                        mb=10,
+                    ),
+                    dmc.MultiSelect(
+                        id="home_teams",
+                        data=sorted(home_team["team_name"].unique().tolist()),
+                        clearable=True,
+                        label="Home Teams",
+                    ),
+                    dmc.MultiSelect(
+                        id="away_teams",
+                        data=sorted(home_team["opponent_name"].unique().tolist()),
+                        clearable=True,
+                        label="Away Teams",
+                    ),
+                    dmc.Progress(id="filter-progress", value=0, size="xs", mt=10),
+                ],
+                span=2,
+                className="filter-card",
+                style={"padding": "15px"},
+            ),
+            dmc.GridCol(
+                [
+                    dmc.Group(
+                        [
+                            dcc.Graph(
+                                figure=go.Figure(),
+                                id="attendance_time",
+                                style={"height": "100%"},
+                            ),
+                            html.Div(
+                                [
+                                    dcc.Graph(
+                                        figure=go.Figure(),
+                                        id="most_attendance",
+                                        style={"height": "100%"},
+                                    )
+                                ],
+                                style={
+                                    "display": "flex",
+                                    "flexDirection": "column",
+                                    "height": "100%",
+                                },
+                            ),
+                        ],
+                        style={
+                            "height": "300px",
+                            "maxHeight": "300px",
+                            "overflow": "hidden",
+                            "padding": "15px",
+                        },
+                    )
+                ],
+                span=10,
+            ),
+        ]
+    )
+
+
+team_names = set(home_team["team_name"].dropna())
+opponent_names = set(home_team["opponent_name"].dropna())
+## background callbacks run in throwaway processes, so share these on disk
+## then; on disk they outlive the process, so they're per dataset version
+filter_cache = register(
+    f"{week_key}-filters", shared_cache(f"{week_key}-{version}-filters", maxsize=64)
+)
+figure_cache = register(
+    f"{week_key}-figures", shared_cache(f"{week_key}-{version}-figures", maxsize=128)
 )
 
 
-@callback(
-    Output("home_attendance_treemap", "figure"),
-    Output("attendance_time", "figure"),
-    Output("most_attendance", "figure"),
-    Input("attendance_range", "value"),
-    Input("date_range", "value"),
-    Input("match_tier", "value"),
-    Input("home_teams", "value"),
-    Input("away_teams", "value"),
-    Input("mode", "checked"),
+def filter_key(attendance, dates, tier, home_teams, away_teams):
+    return (
+        tuple(float(x) for x in attendance),
+        tuple(pd.Timestamp(x).isoformat() for x in dates),
+        str(tier),
+        selection_key(home_teams, team_names),
+        selection_key(away_teams, opponent_names),
+    )
+
+
+home_index = FrameIndex(
+    home_team,
+    categories=["team_name", "opponent_name"],
+    ranges=["attendance", "date"],
+    bitmaps=["tier"],
 )
-def updateTreemap(v, v2, v3, v4, v5, c):
-    if ctx.triggered_id == "mode":
-        newTemplate = pio.templates[
-            "plotly_white" if not c else "plotly_dark"
-        ].to_plotly_json()
-        fig = Patch()
-        fig["layout"]["template"] = newTemplate
-        return [fig] * len(ctx.outputs_list)
-    if len(v) == 2 and len(v2) == 2:
-        try:
-            team_ids = home_team["team_name"].drop_duplicates().tolist()
-            opponent_ids = home_team["opponent_name"].unique().tolist()
-            mask = home_team[
-                (
-                    home_team["team_name"].isin(v4 if len((v4 or [])) > 0 else team_ids)
-                    & home_team["opponent_name"].isin(
-                        v5 if len((v5 or [])) > 0 else opponent_ids
-                    )
-                    & home_team["attendance"].between(v[0], v[1], inclusive="both")
-                    & home_team["date"].between(v2[0], v2[1], inclusive="both")
-                    & home_team["tier"].isin([int(v3)] if not v3 == "All" else [1, 2])
-                )
-            ].dropna(subset=["attendance"])
-            fig = Patch()
-            newTree = px.treemap(
-                mask,
-                path=["team_name", "opponent_name", "date"],
-                values="attendance",
-                color="attendance",
-                template="plotly_white" if not c else "plotly_dark",
-                title="Home Team Attendance Distribution",
-                range_color=[
-                    home_team["attendance"].min(),
-                    home_team["attendance"].max(),
-                ],
-            ).update_layout(default_layout)
-            fig["data"] = newTree.data
-            fig2 = Patch()
-            newScatter = px.scatter(
-                mask,
-                x="date",
-                y="attendance",
-                title="Attendance Over Time",
-                template="plotly_white" if not c else "plotly_dark",
-            ).update_layout(default_layout)
-            fig2["data"] = newScatter.data
-            fig3 = Patch()
-            sorted_df = mask.sort_values("attendance", ascending=False)
-            newMax = go.Figure(
-                go.Indicator(
-                    value=mask["attendance"].max(),
-                    title=f"{sorted_df.iloc[0].loc['match_name']}<br>"
-                    + f"({str(sorted_df.iloc[0].loc['date']).split(' ')[0]})",
-                )
-            ).update_layout(
-                {
-                    **default_layout,
-                    "template": "plotly_white" if not c else "plotly_dark",
-                }
-            )
-            fig3["data"] = newMax.data
-            fig2["layout"] = newScatter.layout
-            fig["layout"] = newTree.layout
-            fig3["layout"] = newMax.layout
-            return [fig, fig2, fig3]
-        except:
-            print(traceback.format_exc())
-            pass
-    return [no_update] * len(ctx.outputs_list)
 
 
-register_page("Visualizations", path="/visualizations", layout=figures)
+home_treemap = TreemapEngine(
+    home_team,
+    path=["team_name", "opponent_name", "date"],
+    values="attendance",
+    incremental=not running_in_background(),
+)
 
-### defaults
 
+def filter_home_team(key):
+    attendance, dates, tier, home_teams, away_teams = key
+    return home_index.query(
+        isin={"team_name": home_teams, "opponent_name": away_teams},
+        between={"attendance": attendance, "date": dates},
+        equals={"tier": [int(tier)] if not tier == "All" else [1, 2]},
+    )
 
-raw_data = [
-    html.H2("Raw Data"),
-    dcc.Markdown(attribution),
-    dmc.TextInput(
-        label="Quick Filter Text",
-        id="filter_raw_data",
-        placeholder="Type to filter all data sets",
-    ),
-    html.Div(
-        [
-            html.Div(
-                [
-                    html.H4(f),
-                    dag.AgGrid(
-                        id={"index": f, "type": "information"},
-                        rowData=data[f].to_dict("records"),
-                        columnDefs=[{"field": x} for x in data[f].columns],
-                        dashGridOptions={"quickFilterText": ""},
-                    ),
-                ]
-            )
-            for f in files
-        ]
-    ),
-]
 
+def scatter_points(mask, x_range=None):
+    points = mask.sort_values("date", kind="stable")
+    trace = reduce_xy(points["date"], points["attendance"], x_range=x_range)
+    return {"x": trace["x"], "y": trace["y"]}
 
-@callback(
-    Output(
-        {"index": ALL, "type": "information"}, "dashGridOptions", allow_duplicate=True
-    ),
-    Input("filter_raw_data", "value"),
-    prevent_initial_call=True,
-)
-def filter_raw_data(v):
-    options = Patch()
-    options["quickFilterText"] = v
-    return [options] * len(files)
 
+def build_figures(key, rows):
+    mask = home_index.take(rows)
+    newTree = go.Figure(home_treemap.trace(rows)).update_layout(
+        default_layout,
+        template="none",
+        title="Home Team Attendance Distribution",
+        coloraxis={
+            "cmin": home_team["attendance"].min(),
+            "cmax": home_team["attendance"].max(),
+            "colorbar": {"title": {"text": "attendance"}},
+        },
+    )
+    newScatter = go.Figure(
+        go.Scattergl(
+            mode="markers",
+            hovertemplate="date=%{x}<br>attendance=%{y}<extra></extra>",
+            **scatter_points(mask),
+        )
+    ).update_layout(
+        default_layout,
+        title="Attendance Over Time",
+        template="none",
+        xaxis_title="date",
+        yaxis_title="attendance",
+        uirevision=repr(key),
+    )
+    if mask.empty:
+        ## no match passes the filters
+        newMax = go.Figure(go.Indicator(mode="number", title="No matching matches"))
+    else:
+        sorted_df = mask.sort_values("attendance", ascending=False)
+        newMax = go.Figure(
+            go.Indicator(
+                value=mask["attendance"].max(),
+                title=f"{sorted_df.iloc[0].loc['match_name']}<br>"
+                + f"({str(sorted_df.iloc[0].loc['date']).split(' ')[0]})",
+            )
+        )
+    newMax.update_layout({**default_layout, "template": "none"})
+    return [f.to_plotly_json() for f in (newTree, newScatter, newMax)]
 
-register_page("Data", path="/data", layout=raw_data)
 
-app.layout = dmc.MantineProvider(
+startup.mark("callbacks")
+coalescer = Coalescer(
+    delay=float(os.environ.get("FF_COALESCE_SECONDS", 0)),
+    directory=shared_dir(f"{week_key}-coalesce") if running_in_background() else None,
+)
+
+debounced_inputs(
+    "filter-values",
     [
-        dmc.AppShell(
-            [
-                dmc.AppShellHeader(
-                    html.Div(
-                        [
-                            html.H2(f"{owner}"),
-                            html.H1(
-                                f"Figure Friday - Year {year} - Week {week}",
-                                className="mantine-visible-from-md",
-                            ),
-                            html.H3(f"FF{year}{week}", className="mantine-hidden-from-md"),
-                            dmc.Group(
-                                [
-                                    dmc.Anchor(
-                                        DashIconify(icon="ion:logo-github", width=35),
-                                        href=f"https://github.com/{owner}",
-                                        style={
-                                            "height": "100%",
-                                            "display": "flex",
-                                            "alignItems": "center",
-                                        },
-                                        target="_blank",
-                                        className="mantine-visible-from-sm",
-                                    ),
-                                    dmc.Anchor(
-                                        DashIconify(
-                                            icon="skill-icons:discord", width=35
-                                        ),
-                                        href="https://discord.com/channels/1247975306472591470",
-                                        style={
-                                            "height": "100%",
-                                            "display": "flex",
-                                            "alignItems": "center",
-                                        },
-                                        target="_blank",
-                                        className="mantine-visible-from-sm",
-                                    ),
-                                    dmc.Anchor(
-                                        html.Img(
-                                            src="https://dash.plotly.com/assets/images/plotly_logo_light.png",
-                                            style={"width": "150px"},
-                                            id="plotly_logo",
-                                        ),
-                                        href="https://dash.plotly.com/",
-                                        style={
-                                            "display": "flex",
-                                            "alignItems": "center",
-                                            "margin": "-15px",
-                                        },
-                                        target="_blank",
-                                        className="mantine-visible-from-sm",
-                                    ),
-                                    dmc.Switch(
-                                        offLabel=DashIconify(
-                                            icon="radix-icons:moon", width=20
-                                        ),
-                                        onLabel=DashIconify(
-                                            icon="radix-icons:sun", width=20
-                                        ),
-                                        size="xl",
-                                        id="mode",
-                                        style={"cursor": "pointer"},
-                                    ),
-                                    dmc.Burger(className="mantine-hidden-from-sm", id="display-nav"),
-                                    dcc.Store(id="theme-switch", storage_type="local"),
-                                ],
-                                gap=5,
-                                style={"height": "100%"},
-                            ),
-                        ],
-                        style={
-                            "display": "flex",
-                            "justifyContent": "space-between",
-                            "alignItems": "center",
-                            "paddingLeft": "25px",
-                            "paddingRight": "25px",
-                            "height": "100%",
-                        },
-                    )
-                ),
-                dmc.AppShellNavbar(
-                    dmc.Stack(
-                        [
-                            dmc.Anchor(
-                                pg["title"],
-                                href=pg["path"],
-                                style={"paddingLeft": "30px", "width": "100%"},
-                            )
-                            for pg in page_registry.values()
-                        ],
-                        align="center",
-                    )
-                ),
-                dmc.AppShellMain(page_container),
-            ],
-            header={"height": 70},
-            padding="xl",
-            zIndex=1400,
-            navbar={
-                "width": 300,
-                "breakpoint": "sm",
-                "collapsed": {"mobile": True},
-            },
-            styles={
-                "main": {
-                    "paddingTop": "var(--app-shell-header-height)",
-                    "paddingBottom": "25px",
-                }
-            },
-        ),
-        dmc.Drawer(
-            dmc.Stack(
-                [
-                    html.Div(
-                        dmc.Anchor(
-                            pg["title"],
-                            href=pg["path"],
-                            style={"paddingLeft": "30px", "width": "100%", "display": "block"},
-                        ),
-                        id={"index": pg["title"], "type": "mobile-nav"},
-                        style={"width": "100%"},
-                    )
-                    for pg in page_registry.values()
-                ],
-                style={"top": "80px", "position": "absolute", "width": "100%"},
-            ),
-            id="nav-drawer",
-        ),
+        ("attendance_range", "value"),
+        ("date_range", "value"),
+        ("match_tier", "value"),
+        ("home_teams", "value"),
+        ("away_teams", "value"),
     ],
-    defaultColorScheme="auto",
-    id="mantine-provider",
 )
 
-clientside_callback(
-    """(n) => {
-        return n
-    }""",
-    Output("nav-drawer", "opened"),
-    Input("display-nav", "opened"),
-)
 
-clientside_callback(
-    """(_) => {
-        return false
-    }""",
-    Output("display-nav", "opened"),
-    Input({"index": ALL, "type": "mobile-nav"}, "n_clicks"),
-    prevent_initial_call=True,
+@background_callback(
+    Output("home_attendance_treemap", "figure"),
+    Output("attendance_time", "figure"),
+    Output("most_attendance", "figure"),
+    Output("figure-state", "data"),
+    Input("filter-values", "data"),
+    State("mode", "checked"),
+    State("figure-state", "data"),
+    State("session-id", "data"),
+    progress=Output("filter-progress", "value"),
+    running=[(Output("filter-progress", "animated"), True, False)],
+    cancel=[Input("_pages_location", "pathname")],
 )
+def updateTreemap(set_progress, values, c, state, session):
+    if not values:
+        return [no_update] * 4
+    v, v2, v3, v4, v5 = values
+    ticket = coalescer.wait(session)
+    ## the date picker sends [start, None] until the second date is picked
+    if len(v) == 2 and len(v2) == 2 and all(v2):
+        key = filter_key(v, v2, v3, v4, v5)
+        token = repr(key)
+        newFigs = figure_cache.get(token)
+        if newFigs is None:
+            set_progress(10)
+            rows = filter_cache.get_or_set(key, lambda: filter_home_team(key))
+            if coalescer.superseded(session, ticket):
+                return [no_update] * 4
+            set_progress(40)
+            newFigs = build_figures(key, rows)
+            figure_cache.put(token, newFigs)
+        set_progress(100)
+        ## diff against the figures this client was last sent
+        state = state or {}
+        oldFigs = figure_cache.get(state["key"]) if state.get("key") else None
+        figs = []
+        for i, newFig in enumerate(newFigs):
+            new = {
+                "data": newFig["data"],
+                "layout": {**newFig["layout"], "template": template(c)},
+            }
+            if oldFigs is None or i in state.get("stale", []):
+                fig = Patch()
+                fig["data"] = new["data"]
+                fig["layout"] = new["layout"]
+            else:
+                old = {
+                    "data": oldFigs[i]["data"],
+                    "layout": {
+                        **oldFigs[i]["layout"],
+                        "template": template(state.get("dark")),
+                    },
+                }
+                fig = diff_patch(old, new)
+            figs.append(fig)
+        return figs + [{"key": token, "dark": bool(c), "stale": []}]
+    return [no_update] * 4
+
+
+theme_toggle(["home_attendance_treemap", "attendance_time", "most_attendance"])
 
 
 @callback(
-    Output({"index": ALL, "type": "information"}, "className"), Input("mode", "checked")
-)
-def updateClassNames(c):
-    return ["ag-theme-alpine-dark" if c else "ag-theme-alpine"] * len(files)
-
-
-clientside_callback(
-    """(c) => {
-        trg = c ? 'dark' : 'light'
-        document.body.classList = [trg]
-        return [trg, `https://dash.plotly.com/assets/images/plotly_logo_${trg}.png`, c]
-    }""",
-    Output("mantine-provider", "forceColorScheme"),
-    Output("plotly_logo", "src"),
-    Output("theme-switch", "data", allow_duplicate=True),
-    Input("mode", "checked"),
+    Output("attendance_time", "figure", allow_duplicate=True),
+    Output("figure-state", "data", allow_duplicate=True),
+    Input("attendance_time", "relayoutData"),
+    State("attendance_range", "value"),
+    State("date_range", "value"),
+    State("match_tier", "value"),
+    State("home_teams", "value"),
+    State("away_teams", "value"),
     prevent_initial_call=True,
 )
+def zoomAttendance(relayout, v, v2, v3, v4, v5):
+    x_range = zoom_range(relayout)
+    if x_range is False or not (len(v) == 2 and len(v2) == 2 and all(v2)):
+        return no_update, no_update
+    key = filter_key(v, v2, v3, v4, v5)
+    rows = filter_cache.get_or_set(key, lambda: filter_home_team(key))
+    fig = Patch()
+    fig["data"][0].update(scatter_points(home_index.take(rows), x_range))
+    ## the scatter no longer matches the cached figure, so resend it whole
+    state = Patch()
+    state["stale"] = [1]
+    return fig, state
+
+
+visualizations = week_page(week_key, "Visualizations", "/visualizations", figures, version)
 
-clientside_callback(
-    """
-        (_, data) => {
-            if (data !== null) {
-                return [data, data]
-            }
-           return [
-            window.matchMedia('(prefers-color-scheme: dark)').matches ? 'dark' : 'light',
-            window.dash_clientside.no_update
-            ]
-        }
-    """,
-    Output("mode", "checked"),
-    Output("theme-switch", "data"),
-    Input("theme-switch", "id"),
-    State("theme-switch", "data"),
+### defaults
+
+raw_data = week_page(
+    week_key, "Data", "/data", raw_data_page(week_key, files, data, attribution), version
 )
 
-app.run(debug=True)
+if not hosted():
+    app.layout = app_shell(owner, f"Figure Friday - Year {year} - Week {week}", f"FF{year}{week}")
+
+startup.finish(layouts=[visualizations, raw_data])
+
+if __name__ == "__main__":
+    serve(app)
@@ -1,84 +1,103 @@
 ### import libraries
+import logging
+import os
+import sys
 import traceback
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from figure_friday.startup import StartupProfiler
+
+startup = StartupProfiler("week-2024-30")
+
 import dash
 from dash import *
+from dash.exceptions import PreventUpdate
 import pandas as pd
-import dash_ag_grid as dag
 import dash_mantine_components as dmc
 import dash_bootstrap_components as dbc
-from dash_iconify import DashIconify
 import plotly.express as px
 import plotly.graph_objects as go
 import plotly.io as pio
 import dash_chart_editor as dce
 
+from figure_friday.background import background_callback, running_in_background, shared_dir
+from figure_friday.charts import chart_specs, compact_chart, compact_layout, hydrate
+from figure_friday.cleaning import normalize_numeric
+from figure_friday.data import dataset_version, load_files
+from figure_friday.editor import data_source_url, lazy_data_sources
+from figure_friday.figures import FigureStore
+from figure_friday.grid import infinite_grid, register_frame
+from figure_friday.reduce import needs_reduction, reduce_figure, zoom_range
+from figure_friday.serve import serve
+from figure_friday.shared import share
+from figure_friday.shell import app_shell, hosted, raw_data_page, week_app, week_page
+
 ### import data
+logging.basicConfig(level=logging.INFO)
 owner = "BSd3v"
-data = {}
 week = "30"
 year = "2024"
-base_url = (
-    f"https://raw.githubusercontent.com/plotly/Figure-Friday/main/{year}/week-{week}/"
-)
+week_key = f"{year}-{week}"
 attribution = """"""
 
 files = ["rural-investments.csv"]
-for f in files:
-    if ".csv" in f.lower():
-        data[f] = pd.read_csv(f"{base_url}/{files[0]}")
-    else:
-        data[f] = pd.read_excel(f"{base_url}/{files[0]}")
+data = load_files(year, week, files)
+version = dataset_version(year, week, files)
 
 
 ### dash app
-stylesheets = [
-    "https://unpkg.com/@mantine/dates@7/styles.css",
-    "https://unpkg.com/@mantine/code-highlight@7/styles.css",
-    "https://unpkg.com/@mantine/charts@7/styles.css",
-    "https://unpkg.com/@mantine/carousel@7/styles.css",
-    "https://unpkg.com/@mantine/notifications@7/styles.css",
-    "https://unpkg.com/@mantine/nprogress@7/styles.css"
-]
-
-dash._dash_renderer._set_react_version("18.2.0")
-
-app = Dash(__name__, use_pages=True, pages_folder="", external_stylesheets=stylesheets)
+startup.mark("app")
+app = week_app(__name__)
+server = app.server
 
 
 ### visualizations
+startup.mark("clean")
 cols_int = ['Investment Dollars', 'Number of Investments']
 main_file = files[0]
 for f in files:
-    for col in cols_int:
-        if col in data[f].columns:
-            data[f][col] = data[f][col].map(
-                    lambda x: int(str(x).replace(",", "")) if x and str(x) != "nan" else None
-                )
+    normalize_numeric(data[f], cols_int)
 data[main_file]['County FIPS'] = data[main_file]['County FIPS'].astype(str).str.replace("'", "").str.zfill(5)
+startup.mark("derive")
+## cleaned frames are read-only from here on; map them from one shared file
+## per frame so every worker reads the same pages
+for f in files:
+    data[f] = share(f"{year}-{week}-{os.path.splitext(f)[0]}", data[f], version)
+editor_data_url = data_source_url(main_file, data[main_file])
+register_frame({"index": "filter-data", "type": "viz-information"}, data[main_file])
+
+## background workers can't see this process's memory, so share the stores on disk
+store_dir = shared_dir("figure-store") if running_in_background() else None
+figure_store = FigureStore(directory=store_dir)
+chart_store = FigureStore("charts", directory=store_dir)
+
+def chart_editor_modal():
+    return dmc.Modal(
+                title="Customizing Charts",
+                children=[
+                    dcc.Input(id="chartId"),
+                    dce.DashChartEditor(
+                        dataSources={},
+                        id="editor",
+                        style={"height": "60vh"},
+                    ),
+                    dmc.Group(
+                        [
+                            dmc.Button("Reset", id="resetEditor"),
+                            dmc.Button("Save", id="saveEditor"),
+                            dmc.Button("Save & Close", id="saveCloseEditor", color="green", variant="outline"),
+                        ]
+                    ),
+                ],
+        id="editorMenu",
+        fullScreen=True,
+        zIndex=3000,
+        style={'display': 'flex', 'flexDirection': 'column'}
+    )
+
+startup.mark("callbacks")
+lazy_data_sources("editor", "editorMenu", "editor-data-url")
 
-chart_editor_modal = dmc.Modal(
-            title="Customizing Charts",
-            children=[
-                dcc.Input(id="chartId"),
-                dce.DashChartEditor(
-                    dataSources=data[main_file].to_dict("list"),
-                    id="editor",
-                    style={"height": "60vh"},
-                ),
-                dmc.Group(
-                    [
-                        dmc.Button("Reset", id="resetEditor"),
-                        dmc.Button("Save", id="saveEditor"),
-                        dmc.Button("Save & Close", id="saveCloseEditor", color="green", variant="outline"),
-                    ]
-                ),
-            ],
-    id="editorMenu",
-    fullScreen=True,
-    zIndex=3000,
-    style={'display': 'flex', 'flexDirection': 'column'}
-)
 
 def make_card(n_clicks, figure=None):
     return dmc.Card(
@@ -121,74 +140,101 @@ def make_card(n_clicks, figure=None):
 @app.callback(
     Output("grid-charts", "children"),
     Input("pattern-match-add-chart", "n_clicks"),
+    State("session-id", "data"),
 )
-def add_card(n_clicks):
+def add_card(n_clicks, session):
+    if not n_clicks:
+        ## the page was just built, so cards from an earlier visit are gone
+        figure_store.clear(session)
+        chart_store.clear(session)
+    figure_store.discard(session, n_clicks)
+    ## an empty spec, so saveCharts can tell a blank card from a lost one
+    chart_store.put(session, n_clicks, compact_chart(None))
     patched_children = Patch()
     new_card = make_card(n_clicks)
     patched_children.append(new_card)
     return patched_children
 
 
+## card registry: card index -> position, kept client-side so a click only
+## sends the affected card to the server
+clientside_callback(
+    """(ids) => Object.fromEntries(ids.map((id, i) => [id.index, i]))""",
+    Output("card-registry", "data"),
+    Input({"type": "dynamic-card", "index": ALL}, "id"),
+)
+
+clientside_callback(
+    """(edits, deletes, editIds, deleteIds, registry, seen) => {
+        seen = seen || {}
+        const clicks = {}
+        let edit = dash_clientside.no_update
+        let remove = dash_clientside.no_update
+        const clicked = (key, n) => (clicks[key] = n || 0) > 0 && n !== seen[key]
+        editIds.forEach((id, i) => {
+            if (clicked(`edit-${id.index}`, edits[i])) {
+                edit = {index: id.index, position: registry[id.index]}
+            }
+        })
+        deleteIds.forEach((id, i) => {
+            if (clicked(`delete-${id.index}`, deletes[i])) {
+                remove = {index: id.index, position: registry[id.index]}
+            }
+        })
+        return [clicks, edit, remove]
+    }""",
+    Output("card-clicks", "data"),
+    Output("card-edit", "data"),
+    Output("card-delete", "data"),
+    Input({"type": "dynamic-edit", "index": ALL}, "n_clicks"),
+    Input({"type": "dynamic-delete", "index": ALL}, "n_clicks"),
+    State({"type": "dynamic-edit", "index": ALL}, "id"),
+    State({"type": "dynamic-delete", "index": ALL}, "id"),
+    State("card-registry", "data"),
+    State("card-clicks", "data"),
+    prevent_initial_call=True,
+)
+
+
 @app.callback(
     Output("grid-charts", "children", allow_duplicate=True),
-    Input({"type": "dynamic-delete", "index": ALL}, "n_clicks"),
-    State({"type": "dynamic-card", "index": ALL}, "id"),
+    Input("card-delete", "data"),
+    State("session-id", "data"),
     prevent_initial_call=True,
 )
-def remove_card(_, ids):
+def remove_card(card, session):
+    figure_store.discard(session, card["index"])
+    chart_store.discard(session, card["index"])
     cards = Patch()
-    if ctx.triggered[0]["value"] > 0:
-        for i in range(len(ids)):
-            if ids[i]["index"] == ctx.triggered_id["index"]:
-                del cards[i]
-                return cards
-    return no_update
+    del cards[card["position"]]
+    return cards
 
 
 @app.callback(
     Output("editorMenu", "opened"),
     Output("editor", "loadFigure"),
     Output("chartId", "value"),
-    Output("oldSum", "data"),
-    Input({"type": "dynamic-edit", "index": ALL}, "n_clicks"),
-    State({"type": "dynamic-output", "index": ALL}, "figure"),
-    State("oldSum", "data"),
-    State({"type": "dynamic-card", "index": ALL}, "id"),
+    Output("editing-card", "data"),
+    Input("card-edit", "data"),
+    State("session-id", "data"),
     prevent_initial_call=True,
 )
-def edit_card(edit, figs, oldSum, ids):
-    if sum(edit) < oldSum:
-        oldSum = sum(edit)
-    if sum(edit) > 0 and sum(edit) > oldSum:
-        oldSum = sum(edit)
-        if ctx.triggered[0]["value"] > 0:
-            for i in range(len(ids)):
-                if ids[i]["index"] == ctx.triggered_id["index"]:
-                    if figs[i]["data"]:
-                        return True, figs[i], ctx.triggered_id["index"], oldSum
-                    return (
-                        True,
-                        {"data": [], "layout": {}},
-                        ctx.triggered_id["index"],
-                        oldSum,
-                    )
-    return no_update, no_update, no_update, oldSum
+def edit_card(card, session):
+    figure = figure_store.get(session, card["index"])
+    return True, figure or {"data": [], "layout": {}}, card["index"], card
 
 
 @app.callback(
     Output("editor", "loadFigure", allow_duplicate=True),
     Input("resetEditor", "n_clicks"),
-    State({"type": "dynamic-output", "index": ALL}, "figure"),
-    State("chartId", "value"),
-    State({"type": "dynamic-card", "index": ALL}, "id"),
+    State("editing-card", "data"),
+    State("session-id", "data"),
     prevent_initial_call=True,
 )
-def reset_figure(reset, figs, chartId, ids):
-    for i in range(len(ids)):
-        if ids[i]["index"] == chartId:
-            if figs[i]["data"]:
-                return figs[i]
-    return {"data": [], "layout": {}}
+def reset_figure(_, editing, session):
+    if not editing:
+        return no_update
+    return figure_store.get(session, editing["index"]) or {"data": [], "layout": {}}
 
 
 @app.callback(
@@ -215,48 +261,70 @@ def close_editor(n):
 @app.callback(
     Output("grid-charts", "children", allow_duplicate=True),
     Input("editor", "figure"),
-    State("chartId", "value"),
-    State({"type": "dynamic-card", "index": ALL}, "id"),
+    State("editing-card", "data"),
+    State("session-id", "data"),
     prevent_initial_call=True,
 )
-def save_to_card(f, v, ids):
-    if f:
+def save_to_card(f, editing, session):
+    if f and editing:
+        figure_store.put(session, editing["index"], f)
+        chart_store.put(session, editing["index"], compact_chart(f))
         figs = Patch()
-        for i in range(len(ids)):
-            if ids[i]["index"] == v:
-                figs[i]["props"]["children"][1]["props"]["figure"] = f
-                return figs
+        figs[editing["position"]]["props"]["children"][1]["props"]["figure"] = reduce_figure(f)
+        return figs
     return no_update
 
 
-figures = html.Div(
-    [
-        dmc.Tabs([
-                dmc.TabsList([
-                    dmc.TabsTab("Charts", value="charts"),
-                    dmc.TabsTab("Filters", value="filters"),
-                    dmc.TabsTab("Filtered Data", value="filtered")
-                ]),
-                dmc.TabsPanel(dag.AgGrid(id={"index": 'filter-data', "type": "viz-information"}, rowData=data[main_file].to_dict('records'),
-                                         columnDefs=[{'field': x} for x in data[main_file].columns],
-                                         style={'height': '100%'}),
-                              value='filtered', style={'height': '100%'}),
-                dmc.TabsPanel([
-                        dmc.Button("Add Chart", id="pattern-match-add-chart", n_clicks=0),
-                        dmc.Button("Load Saved Charts", id="load-charts", n_clicks=0, color='red'),
-                        dmc.Button("Save Chart Layout", id="save-charts", n_clicks=0, color='green'),
-                        dmc.Group(id='grid-charts',
-                                       style={'height': '100%', 'overflow': 'auto', 'padding': '10px'}),
-                        chart_editor_modal,
-                        dcc.Store(id="oldSum", data=0)], value='charts', style={"height": "100%"}),
-                        dcc.Store(id='saved-charts', storage_type='local')
-
-              ],
-                value='charts',
-                style={'height': 'calc(100vh + -150px)'}
-            )
-    ],
+@app.callback(
+    Output({"type": "dynamic-output", "index": MATCH}, "figure"),
+    Input({"type": "dynamic-output", "index": MATCH}, "relayoutData"),
+    State("session-id", "data"),
+    prevent_initial_call=True,
 )
+def zoom_card(relayout, session):
+    x_range = zoom_range(relayout)
+    figure = figure_store.get(session, ctx.triggered_id["index"])
+    if x_range is False or figure is None or not needs_reduction(figure):
+        return no_update
+    fig = Patch()
+    fig["data"] = reduce_figure(figure, x_range=x_range)["data"]
+    return fig
+
+
+def figures():
+    return html.Div(
+        [
+            dmc.Tabs([
+                    dmc.TabsList([
+                        dmc.TabsTab("Charts", value="charts"),
+                        dmc.TabsTab("Filters", value="filters"),
+                        dmc.TabsTab("Filtered Data", value="filtered")
+                    ]),
+                    dmc.TabsPanel(infinite_grid({"index": 'filter-data', "type": "viz-information"}, data[main_file],
+                                                style={'height': '100%'}),
+                                  value='filtered', style={'height': '100%'}),
+                    dmc.TabsPanel([
+                            dmc.Button("Add Chart", id="pattern-match-add-chart", n_clicks=0),
+                            dmc.Button("Load Saved Charts", id="load-charts", n_clicks=0, color='red'),
+                            dmc.Button("Save Chart Layout", id="save-charts", n_clicks=0, color='green'),
+                            dmc.Progress(id="load-progress", value=0, size="xs", mt=5),
+                            dmc.Group(id='grid-charts',
+                                           style={'height': '100%', 'overflow': 'auto', 'padding': '10px'}),
+                            chart_editor_modal(),
+                            dcc.Store(id="editor-data-url", data=editor_data_url),
+                            dcc.Store(id="card-registry", data={}),
+                            dcc.Store(id="card-clicks", data={}),
+                            dcc.Store(id="card-edit"),
+                            dcc.Store(id="card-delete"),
+                            dcc.Store(id="editing-card")], value='charts', style={"height": "100%"}),
+                            dcc.Store(id='saved-charts', storage_type='local')
+
+                  ],
+                    value='charts',
+                    style={'height': 'calc(100vh + -150px)'}
+                )
+        ],
+    )
 
 @callback(
     Output({"index": ALL, "type": "viz-information"}, "className"), Input("mode", "checked")
@@ -267,271 +335,72 @@ def updateClassNames(c):
 @callback(
     Output('saved-charts', 'data'),
     Input('save-charts', 'n_clicks'),
-    State({"type": "dynamic-output", "index": ALL}, 'figure'),
+    State('card-registry', 'data'),
+    State('session-id', 'data'),
     prevent_initial_call=True
 )
-def saveCharts(_, c):
-    figs = []
-    for fig in c:
-        figs.append(dce.cleanDataFromFigure(fig))
-    return figs
-
-@callback(
+def saveCharts(_, registry, session):
+    cards = sorted(registry or {}, key=registry.get)
+    specs = [chart_store.get(session, i) for i in cards]
+    if any(spec is None for spec in specs):
+        ## the server lost some of these charts (restart, eviction); saving
+        ## now would overwrite the saved layout with blank ones
+        raise PreventUpdate
+    return compact_layout(specs)
+
+@background_callback(
     Output('grid-charts', 'children', allow_duplicate=True),
     Output("pattern-match-add-chart", "n_clicks"),
+    Output("card-clicks", "data", allow_duplicate=True),
     Input('load-charts', 'n_clicks'),
     State('saved-charts', 'data'),
+    State('session-id', 'data'),
+    progress=Output("load-progress", "value"),
+    running=[(Output("load-charts", "loading"), True, False)],
+    cancel=[Input("_pages_location", "pathname")],
     prevent_initial_call=True
 )
-def loadCharts(_, c):
+def loadCharts(set_progress, _, c, session):
     children = []
     clicks = 1
-    for fig in c:
-        children.append(make_card(clicks, dce.chartToPython(fig, data[main_file])))
+    set_progress(0)
+    specs = chart_specs(c)
+    ## the loaded cards reuse indices, so forget the figures of the old ones
+    figure_store.clear(session)
+    chart_store.clear(session)
+    figs = hydrate(specs, data[main_file], f"{main_file}-{version}")
+    set_progress(80)
+    for spec, fig in zip(specs, figs):
+        figure_store.put(session, clicks, fig)
+        chart_store.put(session, clicks, spec)
+        children.append(make_card(clicks, reduce_figure(fig)))
         clicks += 1
+    set_progress(100)
 
-    return children, clicks
+    ## the new cards reuse indices with n_clicks back at 0, so forget the
+    ## clicks seen on the old ones
+    return children, clicks, {}
 
 
-register_page("Visualizations", path="/visualizations", layout=figures)
+visualizations = week_page(week_key, "Visualizations", "/visualizations", figures, version)
 
 ### defaults
 
-
-raw_data = [
-    html.H2("Raw Data"),
-    dcc.Markdown(attribution),
-    dmc.TextInput(
-        label="Quick Filter Text",
-        id="filter_raw_data",
-        placeholder="Type to filter all data sets",
-    ),
-    html.Div(
-        [
-            html.Div(
-                [
-                    html.H4(f),
-                    dag.AgGrid(
-                        id={"index": f, "type": "information"},
-                        rowData=data[f].to_dict("records"),
-                        columnDefs=[{"field": x} for x in data[f].columns],
-                        dashGridOptions={"quickFilterText": ""},
-                    ),
-                ]
-            )
-            for f in files
-        ]
-    ),
-]
-
-
-@callback(
-    Output(
-        {"index": ALL, "type": "information"}, "dashGridOptions", allow_duplicate=True
-    ),
-    Input("filter_raw_data", "value"),
-    prevent_initial_call=True,
-)
-def filter_raw_data(v):
-    options = Patch()
-    options["quickFilterText"] = v
-    return [options] * len(files)
-
-
-register_page("Data", path="/data", layout=raw_data)
-
-app.layout = dmc.MantineProvider(
-    [
-        dmc.AppShell(
-            [
-                dmc.AppShellHeader(
-                    html.Div(
-                        [
-                            html.H2(f"{owner}"),
-                            html.H1(
-                                f"Figure Friday - Year {year} - Week {week}",
-                                className="mantine-visible-from-md",
-                            ),
-                            html.H3(f"FF{year}{week}", className="mantine-hidden-from-md"),
-                            dmc.Group(
-                                [
-                                    dmc.Anchor(
-                                        DashIconify(icon="ion:logo-github", width=35),
-                                        href=f"https://github.com/{owner}",
-                                        style={
-                                            "height": "100%",
-                                            "display": "flex",
-                                            "alignItems": "center",
-                                        },
-                                        target="_blank",
-                                        className="mantine-visible-from-sm",
-                                    ),
-                                    dmc.Anchor(
-                                        DashIconify(
-                                            icon="skill-icons:discord", width=35
-                                        ),
-                                        href="https://discord.com/channels/1247975306472591470",
-                                        style={
-                                            "height": "100%",
-                                            "display": "flex",
-                                            "alignItems": "center",
-                                        },
-                                        target="_blank",
-                                        className="mantine-visible-from-sm",
-                                    ),
-                                    dmc.Anchor(
-                                        html.Img(
-                                            src="https://dash.plotly.com/assets/images/plotly_logo_light.png",
-                                            style={"width": "150px"},
-                                            id="plotly_logo",
-                                        ),
-                                        href="https://dash.plotly.com/",
-                                        style={
-                                            "display": "flex",
-                                            "alignItems": "center",
-                                            "margin": "-15px",
-                                        },
-                                        target="_blank",
-                                        className="mantine-visible-from-sm",
-                                    ),
-                                    dmc.Switch(
-                                        offLabel=DashIconify(
-                                            icon="radix-icons:moon", width=20
-                                        ),
-                                        onLabel=DashIconify(
-                                            icon="radix-icons:sun", width=20
-                                        ),
-                                        size="xl",
-                                        id="mode",
-                                        style={"cursor": "pointer"},
-                                    ),
-                                    dmc.Burger(className="mantine-hidden-from-sm", id="display-nav"),
-                                    dcc.Store(id="theme-switch", storage_type="local"),
-                                ],
-                                gap=5,
-                                style={"height": "100%"},
-                            ),
-                        ],
-                        style={
-                            "display": "flex",
-                            "justifyContent": "space-between",
-                            "alignItems": "center",
-                            "paddingLeft": "25px",
-                            "paddingRight": "25px",
-                            "height": "100%",
-                        },
-                    )
-                ),
-                dmc.AppShellNavbar(
-                    dmc.Stack(
-                        [
-                            dmc.Anchor(
-                                pg["title"],
-                                href=pg["path"],
-                                style={"paddingLeft": "30px", "width": "100%"},
-                            )
-                            for pg in page_registry.values()
-                        ],
-                        align="center",
-                    )
-                ),
-                dmc.AppShellMain(page_container),
-            ],
-            header={"height": 70},
-            padding="xl",
-            zIndex=1400,
-            navbar={
-                "width": 300,
-                "breakpoint": "sm",
-                "collapsed": {"mobile": True},
-            },
-            styles={
-                "main": {
-                    "paddingTop": "var(--app-shell-header-height)",
-                    "paddingBottom": "25px",
-                }
-            },
-        ),
-        dmc.Drawer(
-            dmc.Stack(
-                [
-                    html.Div(
-                        dmc.Anchor(
-                            pg["title"],
-                            href=pg["path"],
-                            style={"paddingLeft": "30px", "width": "100%", "display": "block"},
-                        ),
-                        id={"index": pg["title"], "type": "mobile-nav"},
-                        style={"width": "100%"},
-                    )
-                    for pg in page_registry.values()
-                ],
-                style={"top": "80px", "position": "absolute", "width": "100%"},
-            ),
-            id="nav-drawer",
-        ),
-    ],
-    defaultColorScheme="auto",
-    id="mantine-provider",
-    withCssVariables=True,
-    withGlobalClasses=True,
-    withStaticClasses=True
-)
-
-clientside_callback(
-    """(n) => {
-        return n
-    }""",
-    Output("nav-drawer", "opened"),
-    Input("display-nav", "opened"),
+raw_data = week_page(
+    week_key, "Data", "/data", raw_data_page(week_key, files, data, attribution), version
 )
 
-clientside_callback(
-    """(_) => {
-        return false
-    }""",
-    Output("display-nav", "opened"),
-    Input({"index": ALL, "type": "mobile-nav"}, "n_clicks"),
-    prevent_initial_call=True,
-)
-
-
-@callback(
-    Output({"index": ALL, "type": "information"}, "className"), Input("mode", "checked")
-)
-def updateClassNames(c):
-    return ["ag-theme-alpine-dark" if c else "ag-theme-alpine"] * len(files)
-
-
-clientside_callback(
-    """(c) => {
-        trg = c ? 'dark' : 'light'
-        document.body.classList = [trg]
-        return [trg, `https://dash.plotly.com/assets/images/plotly_logo_${trg}.png`, c]
-    }""",
-    Output("mantine-provider", "forceColorScheme"),
-    Output("plotly_logo", "src"),
-    Output("theme-switch", "data", allow_duplicate=True),
-    Input("mode", "checked"),
-    prevent_initial_call=True,
-)
+if not hosted():
+    app.layout = app_shell(
+        owner,
+        f"Figure Friday - Year {year} - Week {week}",
+        f"FF{year}{week}",
+        withCssVariables=True,
+        withGlobalClasses=True,
+        withStaticClasses=True,
+    )
 
-clientside_callback(
-    """
-        (_, data) => {
-            if (data !== null) {
-                return [data, data]
-            }
-           return [
-            window.matchMedia('(prefers-color-scheme: dark)').matches ? 'dark' : 'light',
-            window.dash_clientside.no_update
-            ]
-        }
-    """,
-    Output("mode", "checked"),
-    Output("theme-switch", "data"),
-    Input("theme-switch", "id"),
-    State("theme-switch", "data"),
-)
+startup.finish(layouts=[visualizations, raw_data])
 
-app.run(debug=True)
+if __name__ == "__main__":
+    serve(app)